@@ -80,7 +80,13 @@ export const AuthProvider = ({ children }) => {
 
   const changePassword = async (passwordData) => {
     try {
-      await authAPI.changePassword(passwordData)
+      const response = await authAPI.changePassword(passwordData)
+      // Older tokens are revoked by the password change; keep the session on the new one
+      const { access_token } = response.data
+      if (access_token) {
+        setToken(access_token)
+        localStorage.setItem('admin_token', access_token)
+      }
       return { success: true }
     } catch (error) {
       return { 
@@ -14,13 +14,10 @@ const Dashboard = () => {
   useEffect(() => {
     const fetchStats = async () => {
       try {
-        const [dashboardData, leadsData] = await Promise.all([
-          leadsAPI.getDashboardStats(),
-          leadsAPI.getLeadStats()
-        ])
+        const { data } = await leadsAPI.getDashboardOverview()
         
-        setStats(dashboardData.data)
-        setLeadStats(leadsData.data)
+        setStats(data.stats)
+        setLeadStats(data.lead_stats)
       } catch (error) {
         console.error('Error fetching stats:', error)
       } finally {
@@ -42,56 +42,65 @@ export const authAPI = {
   changePassword: (passwordData) => api.post('/admin/change-password', passwordData),
 }
 
-// Content API
+// Content API (admin lists are paginated: { items, next_cursor, total_estimate })
 export const contentAPI = {
   // Site Info
   getSiteInfo: () => api.get('/site-info'),
   updateSiteInfo: (data) => api.put('/site-info', data),
   
   // Services
-  getServices: () => api.get('/admin/services'),
+  getServices: (cursor, limit) => api.get('/admin/services', { params: { cursor, limit } }),
   createService: (data) => api.post('/services', data),
   updateService: (id, data) => api.put(`/services/${id}`, data),
   deleteService: (id) => api.delete(`/services/${id}`),
   
   // Sectors
-  getSectors: () => api.get('/admin/sectors'),
+  getSectors: (cursor, limit) => api.get('/admin/sectors', { params: { cursor, limit } }),
   createSector: (data) => api.post('/sectors', data),
   updateSector: (id, data) => api.put(`/sectors/${id}`, data),
   deleteSector: (id) => api.delete(`/sectors/${id}`),
   
   // Advantages
-  getAdvantages: () => api.get('/admin/advantages'),
+  getAdvantages: (cursor, limit) => api.get('/admin/advantages', { params: { cursor, limit } }),
   createAdvantage: (data) => api.post('/advantages', data),
   updateAdvantage: (id, data) => api.put(`/advantages/${id}`, data),
   deleteAdvantage: (id) => api.delete(`/advantages/${id}`),
   
   // Solutions
-  getSolutions: () => api.get('/admin/solutions'),
+  getSolutions: (cursor, limit) => api.get('/admin/solutions', { params: { cursor, limit } }),
   createSolution: (data) => api.post('/solutions', data),
   updateSolution: (id, data) => api.put(`/solutions/${id}`, data),
   deleteSolution: (id) => api.delete(`/solutions/${id}`),
   
   // Projects
-  getProjects: () => api.get('/admin/projects'),
+  getProjects: (cursor, limit) => api.get('/admin/projects', { params: { cursor, limit } }),
   createProject: (data) => api.post('/projects', data),
   updateProject: (id, data) => api.put(`/projects/${id}`, data),
   deleteProject: (id) => api.delete(`/projects/${id}`),
   
   // FAQ
-  getFAQ: () => api.get('/admin/faq'),
+  getFAQ: (cursor, limit) => api.get('/admin/faq', { params: { cursor, limit } }),
   createFAQ: (data) => api.post('/faq', data),
   updateFAQ: (id, data) => api.put(`/faq/${id}`, data),
   deleteFAQ: (id) => api.delete(`/faq/${id}`),
+  
+  // Bulk create/update/delete/reorder (collection: services, sectors, advantages, solutions, projects, faq)
+  bulk: (collection, operations) => api.post(`/${collection}/bulk`, { operations }),
 }
 
 // Leads API
 export const leadsAPI = {
-  getLeads: (status) => api.get(`/leads${status ? `?status_filter=${status}` : ''}`),
+  // Paginated: responses are { items, next_cursor, total_estimate }
+  getLeads: (status, cursor, limit) => api.get('/leads', { params: { status_filter: status, cursor, limit } }),
+  searchLeads: (q, status, cursor, limit) => api.get('/leads/search', { params: { q, status_filter: status, cursor, limit } }),
+  recomputeLeadMatches: () => api.post('/leads/matches/recompute'),
+  getLeadAnalytics: (params = {}) => api.get('/leads/analytics', { params }),
+  exportLeads: (format, params = {}) => api.get('/leads/export', { params: { format, ...params }, responseType: 'blob' }),
   getLead: (id) => api.get(`/leads/${id}`),
   updateLeadStatus: (id, data) => api.put(`/leads/${id}/status`, data),
   getLeadStats: () => api.get('/leads/stats'),
   getDashboardStats: () => api.get('/dashboard/stats'),
+  getDashboardOverview: () => api.get('/dashboard/overview'),
 }
 
 // Media API
@@ -114,7 +123,7 @@ export const mediaAPI = {
       },
     })
   },
-  getMediaFiles: (limit) => api.get(`/media${limit ? `?limit=${limit}` : ''}`),
+  getMediaFiles: (limit, cursor) => api.get('/media', { params: { limit, cursor } }),
   deleteMedia: (filename) => api.delete(`/media/${filename}`),
 }
 
@@ -1,24 +1,146 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from models import AdminUser
-from database import Collections, find_one, update_one
+from database import Collections, find_one, find_many, update_one, bulk_write
+from cache import content_versions, invalidate_collection
+from passwords import password_pool
+from pymongo import UpdateOne
+import asyncio
+import hashlib
 import os
+import secrets
+import time
 
 # Security configuration
 SECRET_KEY = os.environ.get("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 24 * 60  # 24 hours
 
+# Resolved principals are reused for this long (seconds) unless admin users change
+AUTH_CACHE_TTL = float(os.environ.get("AUTH_CACHE_TTL", 60))
+AUTH_CACHE_MAX_ENTRIES = int(os.environ.get("AUTH_CACHE_MAX_ENTRIES", 1024))
+# Revoked token ids are reloaded at least this often (seconds), even without a version bump
+REVOCATION_REFRESH_SECONDS = float(os.environ.get("REVOCATION_REFRESH_SECONDS", 5))
+
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # Bearer token scheme
 security = HTTPBearer()
 
+class PrincipalCache:
+    """Validated tokens mapped to their users, so admin requests skip the user lookup.
+
+    Entries are tied to the admin_users version in the shared version table:
+    any write to admin_users (password change, deactivation, login) on any
+    worker outdates every entry. Entries never outlive the token's expiry.
+    """
+
+    def __init__(self, ttl: float = AUTH_CACHE_TTL, max_entries: int = AUTH_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, int, AdminUser, Optional[str]]]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[Tuple[AdminUser, Optional[str]]]:
+        """Cached user and token id, None if missing or outdated"""
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, version, user, jti = entry
+        if expires_at < time.monotonic() or version != content_versions.get(Collections.ADMIN_USERS):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return user, jti
+
+    def set(self, token: str, user: AdminUser, version: int, jti: Optional[str] = None,
+            token_expires_at: Optional[float] = None):
+        lifetime = self.ttl
+        if token_expires_at is not None:
+            lifetime = min(lifetime, token_expires_at - time.time())
+        if lifetime <= 0:
+            return
+        key = self._key(token)
+        self._entries[key] = (time.monotonic() + lifetime, version, user, jti)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+class RevocationList:
+    """Ids (jti) of revoked tokens until their expiry, for O(1) checks per request.
+
+    The list is stored in a Mongo collection whose TTL index drops entries once
+    the token has expired anyway. Each worker keeps the ids in memory and only
+    reloads them when the revoked_tokens version in the shared version table
+    moves, i.e. after a logout on any worker, or after max_age seconds for
+    revocations the version table does not carry (other hosts, fallback
+    per-process counters).
+    """
+
+    def __init__(self, max_age: float = REVOCATION_REFRESH_SECONDS):
+        self.max_age = max_age
+        self._revoked: Dict[str, datetime] = {}
+        self._version: Optional[int] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _is_current(self, version: int) -> bool:
+        return self._version == version and time.monotonic() - self._loaded_at < self.max_age
+
+    def __contains__(self, jti: Optional[str]) -> bool:
+        return jti is not None and jti in self._revoked
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    async def refresh(self):
+        """Reload the ids if a revocation happened since the last load or it is too old"""
+        if self._is_current(content_versions.get(Collections.REVOKED_TOKENS)):
+            return
+        async with self._lock:
+            version = content_versions.get(Collections.REVOKED_TOKENS)
+            if self._is_current(version):
+                return
+            now = datetime.utcnow()
+            documents = await find_many(
+                Collections.REVOKED_TOKENS, {"expires_at": {"$gt": now}}, projection={"expires_at": 1}
+            )
+            self._revoked = {document["_id"]: document["expires_at"] for document in documents}
+            self._version = version
+            self._loaded_at = time.monotonic()
+
+    async def revoke(self, jti: str, expires_at: datetime):
+        """Revoke a token until it expires, on every worker"""
+        await bulk_write(Collections.REVOKED_TOKENS, [
+            UpdateOne({"_id": jti}, {"$set": {"expires_at": expires_at}}, upsert=True)
+        ])
+        now = datetime.utcnow()
+        self._revoked = {key: value for key, value in self._revoked.items() if value > now}
+        self._revoked[jti] = expires_at
+        invalidate_collection(Collections.REVOKED_TOKENS)
+
+def invalidate_admin_users():
+    """Outdate cached principals on every worker after a write to admin_users"""
+    invalidate_collection(Collections.ADMIN_USERS)
+    principal_cache.clear()
+
+# Principal cache and revocation list instances
+principal_cache = PrincipalCache()
+revoked_tokens = RevocationList()
+
 class AuthManager:
     def __init__(self):
         self.pwd_context = pwd_context
@@ -31,6 +153,14 @@ class AuthManager:
         """Hash password"""
         return self.pwd_context.hash(password)
 
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """verify_password on the password pool, off the event loop"""
+        return await password_pool.run(self.verify_password, plain_password, hashed_password)
+
+    async def get_password_hash_async(self, password: str) -> str:
+        """get_password_hash on the password pool, off the event loop"""
+        return await password_pool.run(self.get_password_hash, password)
+
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None):
         """Create JWT access token"""
         to_encode = data.copy()
@@ -40,6 +170,7 @@ class AuthManager:
             expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         
         to_encode.update({"exp": expire})
+        to_encode.setdefault("jti", secrets.token_urlsafe(16))  # lets the token be revoked on logout
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
 
@@ -55,7 +186,7 @@ class AuthManager:
         if not user.active:
             return None
             
-        if not self.verify_password(password, user.hashed_password):
+        if not await self.verify_password_async(password, user.hashed_password):
             return None
             
         # Update last login
@@ -64,6 +195,7 @@ class AuthManager:
             {"username": username},
             {"last_login": datetime.utcnow()}
         )
+        invalidate_admin_users()
         
         return user
 
@@ -75,14 +207,28 @@ class AuthManager:
             headers={"WWW-Authenticate": "Bearer"},
         )
         
+        token = credentials.credentials
+        await revoked_tokens.refresh()
+        cached = principal_cache.get(token)
+        if cached is not None:
+            user, jti = cached
+            if jti in revoked_tokens:
+                raise credentials_exception
+            return user
+        
         try:
-            payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
             username: str = payload.get("sub")
             if username is None:
                 raise credentials_exception
         except JWTError:
             raise credentials_exception
         
+        if payload.get("jti") in revoked_tokens:
+            raise credentials_exception
+        
+        # Read the version first, so a write racing the lookup outdates the entry
+        version = content_versions.get(Collections.ADMIN_USERS)
         user_data = await find_one(Collections.ADMIN_USERS, {"username": username})
         if user_data is None:
             raise credentials_exception
@@ -90,7 +236,12 @@ class AuthManager:
         user = AdminUser(**user_data)
         if not user.active:
             raise credentials_exception
-            
+        
+        # Tokens issued before the last password change carry an older version
+        if payload.get("ver", 0) != user.token_version:
+            raise credentials_exception
+        
+        principal_cache.set(token, user, version, payload.get("jti"), payload.get("exp"))
         return user
 
 # Create auth manager instance
@@ -106,17 +257,21 @@ async def create_default_admin():
     existing_admin = await find_one(Collections.ADMIN_USERS, {"username": "admin"})
     
     if not existing_admin:
-        from database import insert_one
+        hashed_password = await auth_manager.get_password_hash_async("admin123")  # Change in production!
         
         default_admin = {
             "username": "admin",
             "email": "admin@komfort.city",
-            "hashed_password": auth_manager.get_password_hash("admin123"),  # Change in production!
+            "hashed_password": hashed_password,
             "active": True,
             "created_at": datetime.utcnow(),
             "last_login": None
         }
         
-        await insert_one(Collections.ADMIN_USERS, default_admin)
-        print("✅ Default admin user created (username: admin, password: admin123)")
-        print("⚠️  CHANGE DEFAULT PASSWORD IN PRODUCTION!")
\ No newline at end of file
+        # Upsert so workers starting together create the user only once
+        result = await bulk_write(Collections.ADMIN_USERS, [
+            UpdateOne({"username": "admin"}, {"$setOnInsert": default_admin}, upsert=True)
+        ])
+        if result.upserted_count:
+            print("✅ Default admin user created (username: admin, password: admin123)")
+            print("⚠️  CHANGE DEFAULT PASSWORD IN PRODUCTION!")
\ No newline at end of file
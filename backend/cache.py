@@ -0,0 +1,229 @@
+import copy
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from database import find_many, find_one, get_public_read_preference
+from shared_versions import SharedVersionTable, collection_names, default_table_path
+
+logger = logging.getLogger(__name__)
+
+# Cache configuration
+CONTENT_CACHE_TTL = float(os.environ.get("CONTENT_CACHE_TTL", 300))  # seconds
+CONTENT_CACHE_MAX_ENTRIES = int(os.environ.get("CONTENT_CACHE_MAX_ENTRIES", 256))
+
+def _freeze(value: Any) -> Hashable:
+    """Turn filters, sort specs and projections into a hashable cache key part"""
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+class ContentCache:
+    """Size-bounded LRU cache with TTL eviction for public content reads.
+
+    Entries are keyed by collection name plus the frozen query arguments so that
+    a write to one collection drops exactly the entries built from it.
+    """
+
+    def __init__(self, max_entries: int = CONTENT_CACHE_MAX_ENTRIES, ttl: float = CONTENT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, int, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, collection_name: str, key: Hashable, version: int = 0) -> Optional[Any]:
+        """Return a copy of the cached value or None if missing, expired or outdated"""
+        entry_key = (collection_name, key)
+        entry = self._entries.get(entry_key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, entry_version, value = entry
+        if expires_at < time.monotonic() or entry_version != version:
+            del self._entries[entry_key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(entry_key)
+        self.hits += 1
+        # Callers mutate documents (serialize_doc), so never hand out the cached object
+        return copy.deepcopy(value)
+
+    def set(self, collection_name: str, key: Hashable, value: Any, version: int = 0):
+        """Store a value read at the given collection version, evicting LRU entries over the bound"""
+        entry_key = (collection_name, key)
+        self._entries[entry_key] = (time.monotonic() + self.ttl, version, copy.deepcopy(value))
+        self._entries.move_to_end(entry_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, collection_name: str):
+        """Drop every entry built from the given collection"""
+        for entry_key in [k for k in self._entries if k[0] == collection_name]:
+            del self._entries[entry_key]
+
+    def clear(self):
+        """Drop all entries"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+class CollectionVersions:
+    """Per-collection version counters and last modification times.
+
+    Versions are bumped by every content write and feed the ETags of the public
+    endpoints and the staleness checks of the in-process caches. They live in a
+    memory-mapped table shared by all workers on the host (VERSION_TABLE_PATH,
+    empty to disable), so a write on one worker is seen by the others on their
+    next request. Without the table the counters are process-local and the
+    epoch changes on every start, so old tags never match restarted counters.
+    """
+
+    def __init__(self):
+        self._table: Optional[SharedVersionTable] = None
+        self._table_checked = False
+        self._epoch = format(time.time_ns(), "x")
+        self._versions: Dict[str, int] = {}
+        self._last_modified: Dict[str, datetime] = {}
+
+    def _open_table(self) -> Optional[SharedVersionTable]:
+        """Open the shared table on first use (never at import time)"""
+        if not self._table_checked:
+            self._table_checked = True
+            path = os.environ.get("VERSION_TABLE_PATH", default_table_path())
+            if path:
+                try:
+                    self._table = SharedVersionTable(path, collection_names())
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Shared version table unavailable, using local versions: {e}")
+        return self._table
+
+    def _shared(self, collection_name: str) -> Optional[SharedVersionTable]:
+        """Shared table if it is enabled and holds the collection"""
+        table = self._open_table()
+        if table is not None and collection_name in table:
+            return table
+        return None
+
+    @property
+    def epoch(self) -> str:
+        """Identifier of the counter generation"""
+        table = self._open_table()
+        return format(table.epoch, "x") if table else self._epoch
+
+    def get(self, collection_name: str) -> int:
+        """Current version of a collection"""
+        table = self._shared(collection_name)
+        if table:
+            return table.version(collection_name)
+        return self._versions.get(collection_name, 0)
+
+    def bump(self, collection_name: str, modified_at: Optional[datetime] = None):
+        """Record a write to the collection"""
+        modified_at = modified_at or datetime.utcnow()
+        table = self._shared(collection_name)
+        if table:
+            table.bump(collection_name, modified_at)
+            return
+        self._versions[collection_name] = self.get(collection_name) + 1
+        self._last_modified[collection_name] = modified_at
+
+    def observe(self, collection_name: str, modified_at: Optional[datetime]):
+        """Learn a modification time from documents read from the database"""
+        if modified_at is None:
+            return
+        table = self._shared(collection_name)
+        if table:
+            table.observe(collection_name, modified_at)
+            return
+        current = self._last_modified.get(collection_name)
+        if current is None or modified_at > current:
+            self._last_modified[collection_name] = modified_at
+
+    def tag(self, collection_names: Iterable[str]) -> str:
+        """Version tag covering one or more collections"""
+        versions = ".".join(str(self.get(name)) for name in collection_names)
+        return f"{self.epoch}-{versions}"
+
+    def last_modified(self, collection_names: Iterable[str]) -> Optional[datetime]:
+        """Latest modification time of the collections, None if any is unknown"""
+        times = []
+        for name in collection_names:
+            table = self._shared(name)
+            times.append(table.last_modified(name) if table else self._last_modified.get(name))
+        if not times or any(value is None for value in times):
+            return None
+        return max(times)
+
+def _latest_update(documents: Iterable[dict]) -> Optional[datetime]:
+    """Latest updated_at among documents"""
+    times = [doc["updated_at"] for doc in documents if isinstance(doc.get("updated_at"), datetime)]
+    return max(times) if times else None
+
+# Cache and version instances
+content_cache = ContentCache()
+content_versions = CollectionVersions()
+
+# Callbacks notified with the collection name after every invalidation
+_invalidation_listeners: List[Callable[[str], None]] = []
+
+def on_invalidate(listener: Callable[[str], None]):
+    """Register a callback run after a collection is invalidated"""
+    _invalidation_listeners.append(listener)
+
+def _read_preference(primary: bool):
+    # None keeps the client default, which reads from the primary
+    return None if primary else get_public_read_preference()
+
+async def cached_find_many(collection_name: str, filter_dict: dict = None, sort_by: list = None, limit: int = None, projection: dict = None, primary: bool = False):
+    """Read-through variant of database.find_many.
+
+    primary=True reads from the primary (needed right after a write, when a
+    secondary may not have it yet) and is cached apart from public reads.
+    """
+    key = ("many", _freeze(filter_dict or {}), _freeze(sort_by), limit, _freeze(projection), primary)
+    version = content_versions.get(collection_name)
+    documents = content_cache.get(collection_name, key, version)
+    if documents is None:
+        documents = await find_many(
+            collection_name, filter_dict, sort_by, limit, projection,
+            read_preference=_read_preference(primary)
+        )
+        content_versions.observe(collection_name, _latest_update(documents))
+        # Tagged with the version seen before the read, so a racing write outdates it
+        content_cache.set(collection_name, key, documents, version)
+    return documents
+
+async def cached_find_one(collection_name: str, filter_dict: dict, primary: bool = False):
+    """Read-through variant of database.find_one (misses are not cached)"""
+    key = ("one", _freeze(filter_dict), primary)
+    version = content_versions.get(collection_name)
+    document = content_cache.get(collection_name, key, version)
+    if document is None:
+        document = await find_one(collection_name, filter_dict, read_preference=_read_preference(primary))
+        if document is not None:
+            content_versions.observe(collection_name, _latest_update([document]))
+            content_cache.set(collection_name, key, document, version)
+    return document
+
+def invalidate_collection(collection_name: str):
+    """Invalidate cached reads and bump the version after a write to the collection"""
+    content_versions.bump(collection_name)
+    content_cache.invalidate(collection_name)
+    for listener in _invalidation_listeners:
+        listener(collection_name)
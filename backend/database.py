@@ -1,23 +1,94 @@
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel, ReturnDocument, UpdateOne
+from pymongo.errors import OperationFailure
+from pymongo.read_preferences import (
+    Nearest, Primary, PrimaryPreferred, ReadPreference, Secondary, SecondaryPreferred
+)
+import asyncio
+import hashlib
 import os
+import logging
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 class Database:
     client: Optional[AsyncIOMotorClient] = None
     database: Optional[AsyncIOMotorDatabase] = None
+    public_read_preference = ReadPreference.PRIMARY
 
 # Database instance
 db_instance = Database()
 
+# Connection pool settings: environment variable -> MongoClient option
+POOL_OPTIONS = {
+    "MONGO_MAX_POOL_SIZE": "maxPoolSize",
+    "MONGO_MIN_POOL_SIZE": "minPoolSize",
+    "MONGO_MAX_IDLE_TIME_MS": "maxIdleTimeMS",
+    "MONGO_WAIT_QUEUE_TIMEOUT_MS": "waitQueueTimeoutMS",
+    "MONGO_SERVER_SELECTION_TIMEOUT_MS": "serverSelectionTimeoutMS",
+    "MONGO_CONNECT_TIMEOUT_MS": "connectTimeoutMS",
+    "MONGO_SOCKET_TIMEOUT_MS": "socketTimeoutMS",
+}
+
+READ_PREFERENCES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+def client_options() -> dict:
+    """MongoClient pool and timeout options set in the environment (unset keep driver defaults)"""
+    return {
+        option: int(os.environ[variable])
+        for variable, option in POOL_OPTIONS.items()
+        if os.environ.get(variable)
+    }
+
+def public_read_preference_from_env():
+    """Read preference for public content reads (MONGO_PUBLIC_READ_PREFERENCE).
+
+    Admin pages, leads and every write stay on the primary. It applies to
+    cached_find_many/cached_find_one reads without primary=True. Secondary
+    reads may lag behind a write by an unbounded time, and a result cached or
+    served under the bumped collection version keeps its ETag until the next
+    write, so the content routes (snapshots, ?fields= lists) read from the
+    primary.
+    """
+    mode = os.environ.get("MONGO_PUBLIC_READ_PREFERENCE", "primary")
+    if mode not in READ_PREFERENCES:
+        raise ValueError(f"Unknown MONGO_PUBLIC_READ_PREFERENCE: {mode}")
+    if mode == "primary":
+        return Primary()
+
+    max_staleness = os.environ.get("MONGO_PUBLIC_MAX_STALENESS_SECONDS")
+    return READ_PREFERENCES[mode](max_staleness=int(max_staleness) if max_staleness else -1)
+
+async def warm_up_pool(connections: int):
+    """Open pooled connections ahead of the first request with concurrent pings"""
+    db = get_database()
+    await asyncio.gather(
+        db.command("ping", read_preference=db_instance.public_read_preference),
+        *[db.command("ping") for _ in range(max(connections, 1))]
+    )
+
 async def connect_to_mongo():
     """Create database connection"""
     mongo_url = os.environ.get('MONGO_URL')
     db_name = os.environ.get('DB_NAME', 'komfort_city')
+    options = client_options()
     
-    db_instance.client = AsyncIOMotorClient(mongo_url)
+    db_instance.client = AsyncIOMotorClient(mongo_url, **options)
     db_instance.database = db_instance.client[db_name]
+    db_instance.public_read_preference = public_read_preference_from_env()
+    
+    warm_up_connections = int(os.environ.get("MONGO_WARMUP_CONNECTIONS", options.get("minPoolSize", 1)))
+    await warm_up_pool(warm_up_connections)
     
-    print(f"Connected to MongoDB: {db_name}")
+    print(f"Connected to MongoDB: {db_name} (public reads: {db_instance.public_read_preference.mongos_mode})")
 
 async def close_mongo_connection():
     """Close database connection"""
@@ -41,11 +112,94 @@ class Collections:
     LEADS = "leads"
     ADMIN_USERS = "admin_users"
     UPLOADS = "uploads"
+    RATE_LIMITS = "rate_limits"
+    LEAD_ROLLUPS = "lead_rollups"
+    REVOKED_TOKENS = "revoked_tokens"
+
+# Public content lists filter on active and sort by order, created_at
+def _content_indexes(created_direction: int = ASCENDING):
+    return [
+        IndexModel(
+            [("active", ASCENDING), ("order", ASCENDING), ("created_at", created_direction)],
+            name="active_order_created_at"
+        ),
+        IndexModel(
+            [("order", ASCENDING), ("created_at", created_direction), ("_id", created_direction)],
+            name="order_created_at_id"
+        ),
+    ]
+
+# Declared indexes, reconciled at startup by ensure_indexes()
+INDEXES = {
+    Collections.SERVICES: _content_indexes(),
+    Collections.SECTORS: _content_indexes(),
+    Collections.ADVANTAGES: _content_indexes(),
+    Collections.SOLUTIONS: _content_indexes(),
+    Collections.PROJECTS: _content_indexes(DESCENDING),
+    Collections.FAQ: _content_indexes(),
+    Collections.LEADS: [
+        IndexModel(
+            [("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="status_created_at_id"
+        ),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+        # Lead search: words of name/email/message (no stemming, the texts are UA/RU),
+        # phone prefixes and suffixes and email prefixes
+        IndexModel(
+            [("name", TEXT), ("email", TEXT), ("message", TEXT)],
+            name="lead_text",
+            default_language="none",
+            weights={"name": 10, "email": 10, "message": 1}
+        ),
+        IndexModel([("phone_digits", ASCENDING)], name="phone_digits"),
+        IndexModel([("phone_digits_rev", ASCENDING)], name="phone_digits_rev"),
+        IndexModel([("email_lower", ASCENDING)], name="email_lower"),
+    ],
+    Collections.ADMIN_USERS: [
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+    ],
+    Collections.UPLOADS: [
+        IndexModel([("filename", ASCENDING)], name="filename_unique", unique=True),
+        IndexModel([("uploaded_at", DESCENDING), ("_id", DESCENDING)], name="uploaded_at_id"),
+    ],
+    Collections.RATE_LIMITS: [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    Collections.REVOKED_TOKENS: [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+}
+
+# Query shapes used by the routes: (collection, filter, sort), checked by check_query_plans()
+QUERY_SHAPES = [
+    *[
+        (name, {"active": True}, [("order", 1), ("created_at", 1)])
+        for name in (Collections.SERVICES, Collections.SECTORS, Collections.ADVANTAGES,
+                     Collections.SOLUTIONS, Collections.FAQ)
+    ],
+    (Collections.PROJECTS, {"active": True}, [("order", 1), ("created_at", -1)]),
+    (Collections.SERVICES, {}, [("order", 1), ("created_at", 1), ("_id", 1)]),
+    (Collections.PROJECTS, {}, [("order", 1), ("created_at", -1), ("_id", -1)]),
+    (Collections.LEADS, {}, [("created_at", -1), ("_id", -1)]),
+    (Collections.LEADS, {"status": "new"}, [("created_at", -1), ("_id", -1)]),
+    (Collections.LEADS, {"phone_digits": {"$regex": "^38067"}}, None),
+    (Collections.LEADS, {"phone_digits_rev": {"$regex": "^4321"}}, None),
+    (Collections.LEADS, {"email_lower": {"$regex": "^info@"}}, None),
+    (Collections.ADMIN_USERS, {"username": "admin"}, None),
+    (Collections.UPLOADS, {"filename": "example.jpg"}, None),
+    (Collections.UPLOADS, {}, [("uploaded_at", -1), ("_id", -1)]),
+]
 
 # Helper functions for common database operations
-async def get_collection(collection_name: str):
-    """Get collection by name"""
+def get_public_read_preference():
+    """Read preference used for public content reads"""
+    return db_instance.public_read_preference
+
+async def get_collection(collection_name: str, read_preference=None):
+    """Get collection by name, optionally with a non-default read preference"""
     db = get_database()
+    if read_preference is not None:
+        return db.get_collection(collection_name, read_preference=read_preference)
     return db[collection_name]
 
 async def insert_one(collection_name: str, document: dict):
@@ -54,20 +208,26 @@ async def insert_one(collection_name: str, document: dict):
     result = await collection.insert_one(document)
     return result
 
-async def find_one(collection_name: str, filter_dict: dict):
-    """Find one document"""
+async def insert_many(collection_name: str, documents: list, ordered: bool = True):
+    """Insert many documents in one round trip"""
     collection = await get_collection(collection_name)
+    result = await collection.insert_many(documents, ordered=ordered)
+    return result
+
+async def find_one(collection_name: str, filter_dict: dict, read_preference=None):
+    """Find one document"""
+    collection = await get_collection(collection_name, read_preference)
     result = await collection.find_one(filter_dict)
     return result
 
-async def find_many(collection_name: str, filter_dict: dict = None, sort_by: list = None, limit: int = None):
+async def find_many(collection_name: str, filter_dict: dict = None, sort_by: list = None, limit: int = None, projection: dict = None, read_preference=None):
     """Find many documents"""
-    collection = await get_collection(collection_name)
+    collection = await get_collection(collection_name, read_preference)
     
     if filter_dict is None:
         filter_dict = {}
     
-    cursor = collection.find(filter_dict)
+    cursor = collection.find(filter_dict, projection)
     
     if sort_by:
         cursor = cursor.sort(sort_by)
@@ -78,18 +238,100 @@ async def find_many(collection_name: str, filter_dict: dict = None, sort_by: lis
     results = await cursor.to_list(length=None)
     return results
 
+# Streaming and bounded reads
+DEFAULT_BATCH_SIZE = int(os.environ.get("MONGO_BATCH_SIZE", 500))
+MAX_FIND_RESULTS = int(os.environ.get("MAX_FIND_RESULTS", 1000))
+
+def _build_cursor(collection, filter_dict: dict = None, sort_by: list = None, projection: dict = None,
+                  skip: int = 0, limit: int = None, hint=None, batch_size: int = None):
+    cursor = collection.find(filter_dict or {}, projection)
+    if sort_by:
+        cursor = cursor.sort(sort_by)
+    if hint:
+        cursor = cursor.hint(hint)
+    if skip:
+        cursor = cursor.skip(skip)
+    if limit:
+        cursor = cursor.limit(limit)
+    if batch_size:
+        cursor = cursor.batch_size(batch_size)
+    return cursor
+
+async def iter_documents(collection_name: str, filter_dict: dict = None, sort_by: list = None,
+                         projection: dict = None, skip: int = 0, limit: int = None, hint=None,
+                         batch_size: int = DEFAULT_BATCH_SIZE):
+    """Stream documents one by one, fetching them from the server in batches"""
+    collection = await get_collection(collection_name)
+    cursor = _build_cursor(collection, filter_dict, sort_by, projection, skip, limit, hint, batch_size)
+    try:
+        async for document in cursor:
+            yield document
+    finally:
+        await cursor.close()
+
+async def iter_batches(collection_name: str, filter_dict: dict = None, sort_by: list = None,
+                       projection: dict = None, skip: int = 0, limit: int = None, hint=None,
+                       batch_size: int = DEFAULT_BATCH_SIZE):
+    """Stream documents as lists of at most batch_size documents"""
+    batch = []
+    async for document in iter_documents(collection_name, filter_dict, sort_by, projection,
+                                         skip, limit, hint, batch_size):
+        batch.append(document)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+async def find_many_bounded(collection_name: str, filter_dict: dict = None, sort_by: list = None,
+                            limit: int = None, projection: dict = None, skip: int = 0, hint=None):
+    """find_many that never loads more than MAX_FIND_RESULTS documents"""
+    limit = min(limit or MAX_FIND_RESULTS, MAX_FIND_RESULTS)
+    collection = await get_collection(collection_name)
+    cursor = _build_cursor(collection, filter_dict, sort_by, projection, skip, limit, hint)
+    results = await cursor.to_list(length=limit)
+    return results
+
 async def update_one(collection_name: str, filter_dict: dict, update_dict: dict):
     """Update one document"""
     collection = await get_collection(collection_name)
     result = await collection.update_one(filter_dict, {"$set": update_dict})
     return result
 
+async def find_one_and_update(collection_name: str, filter_dict: dict, update: dict, upsert: bool = False,
+                              return_new: bool = True):
+    """Apply an update operator document and return the updated (or the previous) document"""
+    collection = await get_collection(collection_name)
+    result = await collection.find_one_and_update(
+        filter_dict, update, upsert=upsert,
+        return_document=ReturnDocument.AFTER if return_new else ReturnDocument.BEFORE
+    )
+    return result
+
 async def delete_one(collection_name: str, filter_dict: dict):
     """Delete one document"""
     collection = await get_collection(collection_name)
     result = await collection.delete_one(filter_dict)
     return result
 
+async def bulk_write(collection_name: str, requests: list, ordered: bool = False):
+    """Apply a list of pymongo write operations in one round trip"""
+    collection = await get_collection(collection_name)
+    result = await collection.bulk_write(requests, ordered=ordered)
+    return result
+
+async def aggregate(collection_name: str, pipeline: list):
+    """Run an aggregation pipeline and return all result documents"""
+    collection = await get_collection(collection_name)
+    results = await collection.aggregate(pipeline).to_list(length=None)
+    return results
+
+async def estimated_document_count(collection_name: str):
+    """Fast approximate collection size from metadata"""
+    collection = await get_collection(collection_name)
+    count = await collection.estimated_document_count()
+    return count
+
 async def count_documents(collection_name: str, filter_dict: dict = None):
     """Count documents"""
     collection = await get_collection(collection_name)
@@ -98,26 +340,121 @@ async def count_documents(collection_name: str, filter_dict: dict = None):
     count = await collection.count_documents(filter_dict)
     return count
 
+# Index management
+def _same_index(existing: dict, declared: dict) -> bool:
+    """Compare an index_information() entry with a declared IndexModel document"""
+    if "weights" in existing:
+        # Text indexes are stored under the _fts/_ftsx keys with per-field weights
+        declared_fields = [field for field, kind in declared["key"].items() if kind == TEXT]
+        weights = {field: declared.get("weights", {}).get(field, 1) for field in declared_fields}
+        return (
+            existing["weights"] == weights
+            and existing.get("default_language", "english") == declared.get("default_language", "english")
+        )
+    return (
+        list(existing["key"]) == list(declared["key"].items())
+        and bool(existing.get("unique")) == bool(declared.get("unique"))
+    )
+
+async def ensure_indexes():
+    """Create missing declared indexes and rebuild ones whose definition changed"""
+    created = []
+    for collection_name, indexes in INDEXES.items():
+        collection = await get_collection(collection_name)
+        existing = await collection.index_information()
+
+        missing = []
+        for index in indexes:
+            declared = index.document
+            current = existing.get(declared["name"])
+            if current is not None and _same_index(current, declared):
+                continue
+            if current is not None:
+                await collection.drop_index(declared["name"])
+            missing.append(index)
+
+        if missing:
+            try:
+                created.extend(await collection.create_indexes(missing))
+            except OperationFailure as e:
+                # e.g. duplicates blocking a unique index; keep serving and report it
+                logger.error(f"Failed to create indexes on {collection_name}: {e}")
+
+    if created:
+        print(f"✅ Created indexes: {', '.join(created)}")
+    return created
+
+def _plan_stages(plan: dict):
+    """Yield every stage of an explain() plan tree"""
+    if not plan:
+        return
+    yield plan.get("stage")
+    yield from _plan_stages(plan.get("inputStage"))
+    for stage in plan.get("inputStages", []):
+        yield from _plan_stages(stage)
+
+async def check_query_plans():
+    """Explain every declared query shape and report collection scans and in-memory sorts"""
+    problems = []
+    for collection_name, filter_dict, sort_by in QUERY_SHAPES:
+        collection = await get_collection(collection_name)
+        cursor = collection.find(filter_dict)
+        if sort_by:
+            cursor = cursor.sort(sort_by)
+
+        explain = await cursor.explain()
+        stages = set(_plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {})))
+        for stage in ("COLLSCAN", "SORT"):
+            if stage in stages:
+                problems.append({
+                    "collection": collection_name,
+                    "filter": filter_dict,
+                    "sort": sort_by,
+                    "stage": stage
+                })
+                logger.warning(f"Query on {collection_name} {filter_dict} sort={sort_by} uses {stage}")
+
+    if not problems:
+        print("✅ All query shapes are served by indexes")
+    return problems
+
+def seed_id(name: str) -> ObjectId:
+    """Deterministic id of a default document, so concurrent seeding upserts the same document"""
+    return ObjectId(hashlib.sha1(name.encode("utf-8")).hexdigest()[:24])
+
 # Initialize default data
 async def init_default_data():
     """Initialize database with default data from mock.js"""
+    await asyncio.gather(_seed_site_info(), _seed_services())
+    print("✅ Database initialization completed")
+
+async def _seed_site_info():
+    """Create the site info document unless one exists (a single upsert)"""
     from datetime import datetime
     
-    # Check if site_info exists
-    site_info = await find_one(Collections.SITE_INFO, {})
-    if not site_info:
-        default_site_info = {
-            "company_name": "ТОВ «Комфорт.Сіті»",
-            "phone": "+380 XX XXX XX XX",
-            "email": "info@komfort.city",
-            "address": "Адреса офісу",
-            "working_hours": "Пн-Пт: 9:00-18:00, Сб-Нд: 10:00-16:00",
-            "emergency_phone": "+380 XX XXX XX XX",
-            "updated_at": datetime.utcnow()
-        }
-        await insert_one(Collections.SITE_INFO, default_site_info)
+    if await count_documents(Collections.SITE_INFO) > 0:
+        return
+    
+    default_site_info = {
+        "company_name": "ТОВ «Комфорт.Сіті»",
+        "phone": "+380 XX XXX XX XX",
+        "email": "info@komfort.city",
+        "address": "Адреса офісу",
+        "working_hours": "Пн-Пт: 9:00-18:00, Сб-Нд: 10:00-16:00",
+        "emergency_phone": "+380 XX XXX XX XX",
+        "updated_at": datetime.utcnow()
+    }
+    result = await bulk_write(
+        Collections.SITE_INFO,
+        [UpdateOne({"_id": seed_id("site_info")}, {"$setOnInsert": default_site_info}, upsert=True)]
+    )
+    if result.upserted_count:
         print("✅ Default site info created")
 
+async def _seed_services():
+    """Seed the default services into an empty collection with one bulk upsert"""
+    from datetime import datetime
+    
     # Check if services exist
     services_count = await count_documents(Collections.SERVICES)
     if services_count == 0:
@@ -226,9 +563,12 @@ async def init_default_data():
             }
         ]
         
-        for service in default_services:
-            await insert_one(Collections.SERVICES, service)
+        # Upserting by a fixed _id keeps concurrently starting workers from seeding twice
+        result = await bulk_write(Collections.SERVICES, [
+            UpdateOne(
+                {"_id": seed_id(f"services:{service['title']['en']}")}, {"$setOnInsert": service}, upsert=True
+            )
+            for service in default_services
+        ])
         
-        print(f"✅ {len(default_services)} default services created")
-
-    print("✅ Database initialization completed")
\ No newline at end of file
+        print(f"✅ {result.upserted_count} default services created")
@@ -0,0 +1,177 @@
+import csv
+import io
+import re
+import zipfile
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, List
+from xml.sax.saxutils import escape
+
+# Rows are buffered and flushed to the client in chunks of this many rows
+EXPORT_CHUNK_ROWS = 500
+
+# Lead export columns: (header, document field)
+LEAD_COLUMNS = [
+    ("id", "_id"),
+    ("created_at", "created_at"),
+    ("status", "status"),
+    ("name", "name"),
+    ("phone", "phone"),
+    ("email", "email"),
+    ("object_type", "object_type"),
+    ("area", "area"),
+    ("current_fuel", "current_fuel"),
+    ("timeline", "timeline"),
+    ("needs", "needs"),
+    ("message", "message"),
+    ("notes", "notes"),
+    ("updated_at", "updated_at"),
+]
+
+def flatten_value(value: Any) -> Any:
+    """Flatten a document value to a plain cell value"""
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, (list, tuple)):
+        return "; ".join(str(flatten_value(item)) for item in value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return str(value)
+
+def lead_row(document: dict) -> List[Any]:
+    """One export row of a lead document"""
+    return [flatten_value(document.get(field)) for _, field in LEAD_COLUMNS]
+
+# Leading characters spreadsheet apps read as the start of a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+def csv_cell(value: Any) -> Any:
+    """Cell value safe to open in a spreadsheet (text that looks like a formula is quoted)"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+async def stream_csv(documents: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    """Stream documents as UTF-8 CSV (with BOM so Excel detects the encoding)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _ in LEAD_COLUMNS])
+    yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+
+    rows = 0
+    async for document in documents:
+        # Form fields are visitor input; XLSX stores them as inline strings and needs no quoting
+        writer.writerow([csv_cell(value) for value in lead_row(document)])
+        rows += 1
+        if rows % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+# Minimal SpreadsheetML package parts
+XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Leads" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+# Characters not allowed in XML 1.0
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+def _xlsx_row(values: List[Any]) -> str:
+    cells = []
+    for value in values:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f"<c><v>{value}</v></c>")
+        else:
+            text = escape(_INVALID_XML_CHARS.sub("", str(value)))
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f"<row>{''.join(cells)}</row>"
+
+class _ChunkSink:
+    """Write-only file object collecting zip output until it is drained"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+async def stream_xlsx(documents: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    """Stream documents as a single-sheet XLSX workbook.
+
+    The sink is not seekable, so zipfile writes data descriptors after each
+    entry and the workbook never has to be held in memory as a whole.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as workbook:
+        workbook.writestr("[Content_Types].xml", XLSX_CONTENT_TYPES)
+        workbook.writestr("_rels/.rels", XLSX_ROOT_RELS)
+        workbook.writestr("xl/workbook.xml", XLSX_WORKBOOK)
+        workbook.writestr("xl/_rels/workbook.xml.rels", XLSX_WORKBOOK_RELS)
+
+        with workbook.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+                + _xlsx_row([header for header, _ in LEAD_COLUMNS])
+            ).encode("utf-8"))
+
+            rows = []
+            async for document in documents:
+                rows.append(_xlsx_row(lead_row(document)))
+                if len(rows) >= EXPORT_CHUNK_ROWS:
+                    sheet.write("".join(rows).encode("utf-8"))
+                    rows = []
+                    yield sink.drain()
+
+            sheet.write(("".join(rows) + "</sheetData></worksheet>").encode("utf-8"))
+
+    yield sink.drain()
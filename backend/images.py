@@ -0,0 +1,133 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import List, Optional
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Variants are skipped without Pillow
+    Image = None
+
+# Variant settings
+IMAGE_VARIANT_WIDTHS = [
+    int(width) for width in os.environ.get("IMAGE_VARIANT_WIDTHS", "320,640,1024,1600").split(",") if width.strip()
+]
+IMAGE_VARIANT_FORMATS = [
+    name.strip() for name in os.environ.get("IMAGE_VARIANT_FORMATS", "avif,webp,jpeg").split(",") if name.strip()
+]
+IMAGE_VARIANT_QUALITY = int(os.environ.get("IMAGE_VARIANT_QUALITY", 80))
+IMAGE_WORKERS = int(os.environ.get("IMAGE_WORKERS", max((os.cpu_count() or 2) // 2, 1)))
+# Larger images are not decoded (a decoded 50 MP RGBA image takes ~200 MB per worker)
+IMAGE_MAX_PIXELS = int(os.environ.get("IMAGE_MAX_PIXELS", 50_000_000))
+
+# Raster types variants are made for (SVG is already scalable, GIFs may be animated)
+VARIANT_SOURCE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+
+# Format -> (Pillow format name, file extension, content type, save options)
+VARIANT_FORMATS = {
+    "avif": ("AVIF", "avif", "image/avif", {"quality": IMAGE_VARIANT_QUALITY - 20}),
+    "webp": ("WEBP", "webp", "image/webp", {"quality": IMAGE_VARIANT_QUALITY, "method": 4}),
+    "jpeg": ("JPEG", "jpg", "image/jpeg", {"quality": IMAGE_VARIANT_QUALITY, "optimize": True, "progressive": True}),
+}
+
+def supported_formats() -> List[str]:
+    """Configured variant formats the installed Pillow can encode"""
+    if Image is None:
+        return []
+    return [
+        name for name in IMAGE_VARIANT_FORMATS
+        if name in VARIANT_FORMATS and (name == "jpeg" or features.check(name))
+    ]
+
+def render_variants(source: str, directory: str, stem: str, widths: List[int], formats: List[str]) -> List[dict]:
+    """Write resized copies of an image; runs in a worker process"""
+    written = []
+    with Image.open(source) as original:
+        # Only the header is read so far; refuse decompression bombs before decoding
+        if original.width * original.height > IMAGE_MAX_PIXELS:
+            raise ValueError(f"Image too large for variants ({original.width}x{original.height})")
+        image = ImageOps.exif_transpose(original)
+        has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+        for width in sorted(set(widths)):
+            # Never upscale; the original serves as the largest size
+            if width >= image.width:
+                continue
+            height = round(image.height * width / image.width)
+            resized = image.resize((width, height), Image.LANCZOS)
+
+            for name in formats:
+                pillow_format, extension, content_type, options = VARIANT_FORMATS[name]
+                frame = resized
+                if name == "jpeg" and has_alpha:
+                    # JPEG has no alpha; flatten onto white like browsers show the original
+                    frame = Image.new("RGB", resized.size, (255, 255, 255))
+                    frame.paste(resized, mask=resized.getchannel("A"))
+                filename = f"{stem}-{width}w.{extension}"
+                path = Path(directory) / filename
+                frame.save(path, pillow_format, **options)
+                written.append({
+                    "filename": filename,
+                    "url": f"/api/media/{filename}",
+                    "width": width,
+                    "height": height,
+                    "format": name,
+                    "content_type": content_type,
+                    "size": path.stat().st_size
+                })
+    return written
+
+class ImageVariantPool:
+    """Process pool producing resized variants of uploaded images.
+
+    Decoding and encoding (AVIF especially) is CPU heavy, so it runs in worker
+    processes and the upload handler only awaits the result.
+    """
+
+    def __init__(self, workers: int = IMAGE_WORKERS):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def create_variants(self, file_path: Path) -> List[dict]:
+        """Variants of an uploaded image, [] if the file type or the environment has none"""
+        formats = supported_formats()
+        if not formats or file_path.suffix.lower() not in VARIANT_SOURCE_EXTENSIONS:
+            return []
+        if self._executor is None:
+            # Forking the running server would copy its event loop, Mongo client and
+            # locks into the workers; start them from a clean forkserver instead
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("forkserver")
+            )
+        executor = self._executor
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, render_variants,
+                str(file_path), str(file_path.parent), file_path.stem, IMAGE_VARIANT_WIDTHS, formats
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); the pool is unusable, so the
+            # next upload starts a new one
+            if self._executor is executor:
+                self.shutdown()
+            raise
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+def remove_variants(directory: Path, variants: List[dict]):
+    """Delete the variant files of an upload"""
+    for variant in variants or []:
+        path = directory / variant["filename"]
+        if path.exists():
+            path.unlink()
+
+# Pool instance
+image_variants = ImageVariantPool()
@@ -0,0 +1,213 @@
+import asyncio
+import fcntl
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+
+from bson import ObjectId, json_util
+from pymongo.errors import BulkWriteError
+
+from database import Collections, insert_many
+from rollups import record_leads
+
+logger = logging.getLogger(__name__)
+
+# Write-behind settings; an empty LEAD_SPOOL_DIR writes leads straight to Mongo
+LEAD_SPOOL_DIR = os.environ.get("LEAD_SPOOL_DIR", "/app/spool/leads")
+LEAD_FLUSH_INTERVAL = float(os.environ.get("LEAD_FLUSH_INTERVAL", 0.5))  # seconds
+LEAD_FLUSH_BATCH = int(os.environ.get("LEAD_FLUSH_BATCH", 500))
+LEAD_FLUSH_MAX_BACKOFF = float(os.environ.get("LEAD_FLUSH_MAX_BACKOFF", 30))  # seconds
+
+DUPLICATE_KEY = 11000
+
+class SpoolSegment:
+    """Append-only JSON lines file of spooled documents.
+
+    The file stays locked (flock) while a process owns it, so a starting worker
+    only replays segments left behind by processes that are gone.
+    """
+
+    def __init__(self, path: Path, fd: int, documents: List[dict] = None):
+        self.path = path
+        self._fd = fd
+        self.documents = documents or []
+
+    @classmethod
+    def create(cls, directory: Path) -> "SpoolSegment":
+        path = directory / f"{time.time_ns()}-{os.getpid()}.jsonl"
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return cls(path, fd)
+
+    @classmethod
+    def claim(cls, path: Path) -> Optional["SpoolSegment"]:
+        """Take over an abandoned segment, None if another process still owns it"""
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+
+        documents = []
+        with open(path, "rb") as spool:
+            for line_number, line in enumerate(spool, 1):
+                try:
+                    documents.append(json_util.loads(line))
+                except ValueError:
+                    # A torn last line from a crash mid-append was never acknowledged
+                    logger.warning(f"Skipping unreadable line {line_number} of {path}")
+        return cls(path, fd, documents)
+
+    def append(self, document: dict):
+        """Durably append one document"""
+        os.write(self._fd, (json_util.dumps(document) + "\n").encode("utf-8"))
+        os.fsync(self._fd)
+        self.documents.append(document)
+
+    def remove(self):
+        """Delete the segment once its documents are in the database"""
+        os.unlink(self.path)
+        os.close(self._fd)
+
+class LeadIngestQueue:
+    """Write-behind queue between the contact form and the leads collection.
+
+    A submission is acknowledged once it is fsynced to the current spool
+    segment. A background task seals the segment and inserts its documents with
+    unordered insert_many calls. Documents carry their _id from the start, so
+    a batch retried after a partial failure or replayed after a crash only
+    hits duplicate key errors for the leads already stored.
+    """
+
+    def __init__(self, directory: Optional[str], collection_name: str,
+                 after_insert: Callable[[List[dict]], Awaitable[None]] = None):
+        self.directory = Path(directory) if directory else None
+        self.collection_name = collection_name
+        self.after_insert = after_insert
+        self._lock = threading.Lock()
+        self._current: Optional[SpoolSegment] = None
+        self._sealed: List[SpoolSegment] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    @property
+    def running(self) -> bool:
+        """True while submissions go through the spool"""
+        return self._task is not None
+
+    def pending(self) -> int:
+        """Documents spooled but not yet inserted"""
+        current = len(self._current.documents) if self._current else 0
+        return current + sum(len(segment.documents) for segment in self._sealed)
+
+    async def start(self):
+        """Replay abandoned segments and start the flusher"""
+        if not self.enabled:
+            return
+        try:
+            replayed = await asyncio.to_thread(self._claim_abandoned)
+        except OSError as e:
+            logger.error(f"Lead spool {self.directory} unavailable, leads are written directly: {e}")
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        if replayed:
+            print(f"✅ Replaying {replayed} spooled leads")
+
+    async def stop(self):
+        """Stop the flusher after a last flush attempt (what fails stays spooled)"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"Leads left in the spool at shutdown: {e}")
+
+    def _claim_abandoned(self) -> int:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        replayed = 0
+        for path in sorted(self.directory.glob("*.jsonl")):
+            segment = SpoolSegment.claim(path)
+            if segment is not None:
+                self._sealed.append(segment)
+                replayed += len(segment.documents)
+        return replayed
+
+    def _append(self, document: dict):
+        with self._lock:
+            if self._current is None:
+                self._current = SpoolSegment.create(self.directory)
+            self._current.append(document)
+
+    async def submit(self, document: dict) -> ObjectId:
+        """Assign an _id and spool the document; it reaches the database shortly after"""
+        document.setdefault("_id", ObjectId())
+        await asyncio.to_thread(self._append, document)
+        if self.pending() >= LEAD_FLUSH_BATCH and self._wakeup is not None:
+            self._wakeup.set()
+        return document["_id"]
+
+    def _seal(self):
+        with self._lock:
+            if self._current is not None and self._current.documents:
+                self._sealed.append(self._current)
+                self._current = None
+
+    async def flush(self):
+        """Insert every spooled document, removing each segment once it is stored"""
+        self._seal()
+        while self._sealed:
+            segment = self._sealed[0]
+            for start in range(0, len(segment.documents), LEAD_FLUSH_BATCH):
+                await self._insert(segment.documents[start:start + LEAD_FLUSH_BATCH])
+            self._sealed.pop(0)
+            await asyncio.to_thread(segment.remove)
+
+    async def _insert(self, documents: List[dict]):
+        try:
+            await insert_many(self.collection_name, documents, ordered=False)
+            inserted = documents
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            errors = [error for error in write_errors if error.get("code") != DUPLICATE_KEY]
+            if errors or e.details.get("writeConcernErrors"):
+                raise
+            # Duplicates were stored by an earlier attempt and already went through after_insert
+            duplicates = {error["index"] for error in write_errors}
+            inserted = [document for index, document in enumerate(documents) if index not in duplicates]
+
+        if self.after_insert and inserted:
+            await self.after_insert(inserted)
+
+    async def _run(self):
+        backoff = LEAD_FLUSH_INTERVAL
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=backoff)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+                backoff = LEAD_FLUSH_INTERVAL
+            except Exception as e:
+                backoff = min(max(backoff, LEAD_FLUSH_INTERVAL) * 2, LEAD_FLUSH_MAX_BACKOFF)
+                logger.warning(f"Lead flush failed ({self.pending()} pending), retrying in {backoff}s: {e}")
+
+# Queue instance
+lead_ingest = LeadIngestQueue(LEAD_SPOOL_DIR, Collections.LEADS, after_insert=record_leads)
@@ -0,0 +1,88 @@
+import asyncio
+import re
+from typing import List, Optional
+
+from pymongo import UpdateOne
+
+from database import Collections, bulk_write, find_many_bounded, iter_batches
+
+# Shortest digit run treated as a phone number fragment
+MIN_PHONE_DIGITS = 3
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """Digits of a phone number, national Ukrainian numbers with the 38 country code"""
+    digits = re.sub(r"\D", "", phone or "")
+    if len(digits) == 10 and digits.startswith("0"):
+        digits = "38" + digits
+    return digits
+
+def search_fields(lead: dict) -> dict:
+    """Normalized fields stored with a lead so prefix and suffix lookups hit an index"""
+    digits = normalize_phone(lead.get("phone"))
+    return {
+        "phone_digits": digits,
+        "phone_digits_rev": digits[::-1],
+        "email_lower": (lead.get("email") or "").strip().lower()
+    }
+
+def prefix_filters(query: str) -> List[dict]:
+    """Anchored (index range) filters for phone prefixes/suffixes and email prefixes"""
+    filters = []
+    digits = re.sub(r"\D", "", query)
+    if len(digits) >= MIN_PHONE_DIGITS and not re.search(r"[^\d\s()+\-.]", query):
+        prefix = "38" + digits if digits.startswith("0") else digits
+        filters.append({"phone_digits": {"$regex": f"^{re.escape(prefix)}"}})
+        filters.append({"phone_digits_rev": {"$regex": f"^{re.escape(digits[::-1])}"}})
+    elif " " not in query:
+        filters.append({"email_lower": {"$regex": f"^{re.escape(query.lower())}"}})
+    return filters
+
+def _scoped(filter_dict: dict, base_filter: dict) -> dict:
+    return {"$and": [base_filter, filter_dict]} if base_filter else filter_dict
+
+async def search_leads(query: str, base_filter: dict, limit: int) -> List[dict]:
+    """Leads matching the query, best first: phone/email prefix hits, then by text score.
+
+    Both lookups run concurrently and are bounded by limit, so the cost depends
+    on the number of matches, not on the size of the collection.
+    """
+    query = query.strip()
+    text_lookup = find_many_bounded(
+        Collections.LEADS,
+        _scoped({"$text": {"$search": query}}, base_filter),
+        [("score", {"$meta": "textScore"}), ("created_at", -1)],
+        limit,
+        {"score": {"$meta": "textScore"}}
+    )
+    prefix_lookups = [
+        find_many_bounded(Collections.LEADS, _scoped(prefix, base_filter), [("created_at", -1)], limit)
+        for prefix in prefix_filters(query)
+    ]
+    *prefix_results, text_results = await asyncio.gather(*prefix_lookups, text_lookup)
+
+    seen = set()
+    results = []
+    for document in [doc for docs in prefix_results for doc in docs] + text_results:
+        if document["_id"] not in seen:
+            seen.add(document["_id"])
+            document.pop("score", None)
+            results.append(document)
+    return results[:limit]
+
+async def backfill_search_fields():
+    """Add the normalized search fields to leads stored before they existed"""
+    updated = 0
+    async for batch in iter_batches(
+        Collections.LEADS,
+        {"phone_digits": {"$exists": False}},
+        projection={"phone": 1, "email": 1}
+    ):
+        result = await bulk_write(
+            Collections.LEADS,
+            [UpdateOne({"_id": lead["_id"]}, {"$set": search_fields(lead)}) for lead in batch]
+        )
+        updated += result.modified_count
+
+    if updated:
+        print(f"✅ Search fields added to {updated} leads")
+    return updated
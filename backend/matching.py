@@ -0,0 +1,251 @@
+import asyncio
+import bisect
+import logging
+import math
+import os
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from cache import CONTENT_CACHE_TTL, content_versions
+from database import Collections, bulk_write, find_many, iter_batches
+
+logger = logging.getLogger(__name__)
+
+# Matches stored per lead and returned per request
+MAX_MATCHES = int(os.environ.get("MAX_SOLUTION_MATCHES", 3))
+
+# Design heat load per m² of heated area by object type (W/m²)
+HEAT_LOAD_W_PER_M2 = {
+    "production": 120,
+    "office": 80,
+    "hotel": 90,
+    "medical": 100,
+    "residential": 70,
+    "educational": 90,
+    "warehouse": 60,
+    "agriculture": 110,
+}
+DEFAULT_HEAT_LOAD_W_PER_M2 = 100
+
+# Multipliers of the unit words found in range strings (power in kW, money in UAH)
+POWER_UNITS = {"вт": 0.001, "w": 0.001, "квт": 1, "kw": 1, "мвт": 1000, "mw": 1000}
+MONEY_UNITS = {"тис": 1e3, "тыс": 1e3, "k": 1e3, "млн": 1e6, "m": 1e6, "mln": 1e6}
+
+_NUMBER = r"(\d+(?:[.,]\d+)?)\s*([a-zа-яіїє]+)?"
+_LOWER_ONLY = re.compile(r"^\s*(?:(?:від|от|from)\b|>)", re.IGNORECASE)
+_UPPER_ONLY = re.compile(r"^\s*(?:(?:до|up to|to)\b|<)", re.IGNORECASE)
+
+def parse_range(text: Optional[str], units: Dict[str, float]) -> Optional[Tuple[float, float]]:
+    """Numeric interval of a free-text range such as "100 кВт - 10 МВт" or "від 500 тис. грн".
+
+    A unit applies to the numbers before it that have none ("50-200 кВт").
+    "від/from X" has no upper bound and "до/up to X" starts at zero.
+    """
+    if not text:
+        return None
+    values = []
+    pending = []
+    for number, word in re.findall(_NUMBER, text.lower()):
+        value = float(number.replace(",", "."))
+        multiplier = units.get(word.rstrip(".")) if word else None
+        if multiplier is None:
+            pending.append(value)
+            continue
+        values.extend(item * multiplier for item in pending)
+        values.append(value * multiplier)
+        pending = []
+    # Numbers without any unit are taken in the base unit
+    values.extend(pending)
+
+    if not values:
+        return None
+    if _LOWER_ONLY.match(text):
+        return values[0], math.inf
+    if _UPPER_ONLY.match(text):
+        return 0.0, values[0]
+    return min(values), max(values)
+
+def estimate_heat_load(area: Optional[float], object_type: Any) -> Optional[float]:
+    """Design heat load in kW from heated area and object type"""
+    if not area or area <= 0:
+        return None
+    object_type = getattr(object_type, "value", object_type)
+    return area * HEAT_LOAD_W_PER_M2.get(object_type, DEFAULT_HEAT_LOAD_W_PER_M2) / 1000
+
+class SolutionRange(NamedTuple):
+    low: float
+    high: float
+    popular: bool
+    solution: dict
+
+def fit_score(load: float, low: float, high: float) -> float:
+    """1 at the geometric middle of the interval, falling towards 0 at its bounds"""
+    if math.isinf(high):
+        high = low * 10 if low > 0 else load * 10
+    low = max(low, 1e-3)
+    if high <= low:
+        return 1.0
+    position = (math.log(load) - math.log(low)) / (math.log(high) - math.log(low))
+    return max(0.0, 1 - abs(position - 0.5) * 2)
+
+class SolutionIndex:
+    """Solutions sorted by the lower bound of their power interval.
+
+    A lookup bisects to the solutions starting at or below the load and keeps
+    the ones whose upper bound covers it; with a handful of solutions that is
+    a few microseconds per lead.
+    """
+
+    def __init__(self, solutions: List[dict]):
+        ranges = []
+        for solution in solutions:
+            power = parse_range(solution.get("power_range"), POWER_UNITS)
+            if power is not None:
+                ranges.append(SolutionRange(power[0], power[1], bool(solution.get("popular")), solution))
+        self.ranges = sorted(ranges, key=lambda item: item.low)
+        self._lows = [item.low for item in self.ranges]
+
+    def __len__(self) -> int:
+        return len(self.ranges)
+
+    def match(self, load: Optional[float], limit: int = MAX_MATCHES) -> List[Tuple[float, SolutionRange]]:
+        """Solutions whose power interval covers the load, best fit first"""
+        if not load:
+            return []
+        candidates = self.ranges[:bisect.bisect_right(self._lows, load)]
+        return self._rank(load, [item for item in candidates if item.high >= load], limit)
+
+    def match_many(self, loads: List[Optional[float]], limit: int = MAX_MATCHES) -> List[List[Tuple[float, SolutionRange]]]:
+        """match() for many loads at once: one sweep over loads in ascending order"""
+        results: List[List[Tuple[float, SolutionRange]]] = [[] for _ in loads]
+        order = sorted((load, position) for position, load in enumerate(loads) if load)
+        active: List[SolutionRange] = []
+        next_range = 0
+        for load, position in order:
+            while next_range < len(self.ranges) and self.ranges[next_range].low <= load:
+                active.append(self.ranges[next_range])
+                next_range += 1
+            active = [item for item in active if item.high >= load]
+            results[position] = self._rank(load, active, limit)
+        return results
+
+    @staticmethod
+    def _rank(load: float, candidates: List[SolutionRange], limit: int) -> List[Tuple[float, SolutionRange]]:
+        scored = [(round(fit_score(load, item.low, item.high) + (0.1 if item.popular else 0), 3), item)
+                  for item in candidates]
+        scored.sort(key=lambda pair: -pair[0])
+        return scored[:limit]
+
+def match_view(score: float, item: SolutionRange) -> dict:
+    """Public description of one match"""
+    solution = item.solution
+    budget = parse_range(solution.get("budget_range"), MONEY_UNITS)
+    return {
+        "solution_id": str(solution["_id"]),
+        "title": solution.get("title"),
+        "power_range": solution.get("power_range"),
+        "budget_range": solution.get("budget_range"),
+        "power_min_kw": item.low,
+        "power_max_kw": None if math.isinf(item.high) else item.high,
+        "budget_min": budget[0] if budget else None,
+        "score": score
+    }
+
+class MatchingEngine:
+    """Holds the solution index and rebuilds it when the solutions change.
+
+    The index is tied to the solutions version, which every worker sees through
+    the shared version table, and expires after CONTENT_CACHE_TTL for edits
+    made outside the API. The contact form only uses the index already built
+    (current_index) so a lead never waits on the solutions query.
+    """
+
+    def __init__(self, max_age: float = CONTENT_CACHE_TTL):
+        self.max_age = max_age
+        self._index: Optional[SolutionIndex] = None
+        self._version: Optional[int] = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _is_current(self, version: int) -> bool:
+        return self._index is not None and self._version == version and self._expires_at > time.monotonic()
+
+    async def get_index(self) -> SolutionIndex:
+        """Current solution index, rebuilt after a solutions write"""
+        version = content_versions.get(Collections.SOLUTIONS)
+        if self._is_current(version):
+            return self._index
+
+        async with self._lock:
+            if not self._is_current(version):
+                solutions = await find_many(
+                    Collections.SOLUTIONS,
+                    {"active": True},
+                    projection={"title": 1, "power_range": 1, "budget_range": 1, "popular": 1}
+                )
+                self._index = SolutionIndex(solutions)
+                self._version = version
+                self._expires_at = time.monotonic() + self.max_age
+        return self._index
+
+    async def refresh(self):
+        """Rebuild the index if outdated; failures are logged and retried on next use"""
+        try:
+            await self.get_index()
+        except Exception as e:
+            logger.warning(f"Solution index refresh failed: {e}")
+
+    def current_index(self) -> Optional[SolutionIndex]:
+        """Index built so far without waiting (None before the first build).
+
+        An outdated index is still returned and rebuilt in the background.
+        """
+        if not self._is_current(content_versions.get(Collections.SOLUTIONS)):
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(self.refresh())
+        return self._index
+
+    async def match_lead(self, lead: dict) -> List[dict]:
+        """Ranked matching solutions of one lead"""
+        index = await self.get_index()
+        load = estimate_heat_load(lead.get("area"), lead.get("object_type"))
+        return [match_view(score, item) for score, item in index.match(load)]
+
+    def match_fields(self, lead: dict) -> dict:
+        """Estimated load and matched solution ids stored with a lead, {} without an index yet"""
+        index = self.current_index()
+        if index is None:
+            return {}
+        load = estimate_heat_load(lead.get("area"), lead.get("object_type"))
+        return {
+            "heat_load_kw": load,
+            "matched_solutions": [str(item.solution["_id"]) for _, item in index.match(load)],
+            "matched_at": datetime.utcnow()
+        }
+
+    async def recompute_all(self) -> int:
+        """Re-match every lead against the current solutions, a batch at a time"""
+        index = await self.get_index()
+        updated = 0
+        async for batch in iter_batches(Collections.LEADS, projection={"area": 1, "object_type": 1}):
+            loads = [estimate_heat_load(lead.get("area"), lead.get("object_type")) for lead in batch]
+            matched_at = datetime.utcnow()
+            requests = [
+                UpdateOne({"_id": lead["_id"]}, {"$set": {
+                    "heat_load_kw": load,
+                    "matched_solutions": [str(item.solution["_id"]) for _, item in matches],
+                    "matched_at": matched_at
+                }})
+                for lead, load, matches in zip(batch, loads, index.match_many(loads))
+            ]
+            result = await bulk_write(Collections.LEADS, requests)
+            updated += result.modified_count
+        return updated
+
+# Engine instance
+matching_engine = MatchingEngine()
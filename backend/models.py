@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Generic, TypeVar
 from datetime import datetime
 from enum import Enum
 
@@ -10,6 +10,11 @@ class MultilingualText(BaseModel):
     en: str
 
 # Enums
+class Language(str, Enum):
+    ua = "ua"
+    ru = "ru"
+    en = "en"
+
 class LeadStatus(str, Enum):
     new = "new"
     in_progress = "in_progress"
@@ -255,9 +260,24 @@ class Lead(BaseModel):
     message: Optional[str] = None
     status: LeadStatus = LeadStatus.new
     notes: Optional[str] = None
+    heat_load_kw: Optional[float] = None
+    matched_solutions: List[str] = []
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+class SolutionMatch(BaseModel):
+    solution_id: str
+    title: Optional[MultilingualText] = None
+    power_range: Optional[str] = None
+    budget_range: Optional[str] = None
+    power_min_kw: float
+    power_max_kw: Optional[float] = None  # None = no upper bound
+    budget_min: Optional[float] = None
+    score: float
+
+class LeadDetail(Lead):
+    matches: List[SolutionMatch] = []
+
 class LeadCreate(BaseModel):
     object_type: ObjectType
     area: float
@@ -273,6 +293,30 @@ class LeadUpdate(BaseModel):
     status: Optional[LeadStatus] = None
     notes: Optional[str] = None
 
+class AnalyticsGranularity(str, Enum):
+    day = "day"
+    week = "week"
+
+class LeadRollupBucket(BaseModel):
+    start: Optional[datetime] = None
+    count: int = 0
+    area: float = 0
+    object_type: Dict[str, int] = {}
+    current_fuel: Dict[str, int] = {}
+    timeline: Dict[str, int] = {}
+    status: Dict[str, int] = {}
+
+class LeadAnalytics(BaseModel):
+    date_from: datetime
+    date_to: datetime
+    granularity: AnalyticsGranularity
+    buckets: List[LeadRollupBucket]
+    totals: LeadRollupBucket
+
+class ExportFormat(str, Enum):
+    csv = "csv"
+    xlsx = "xlsx"
+
 # Admin User Model
 class AdminUser(BaseModel):
     id: Optional[str] = Field(default=None, alias="_id")
@@ -280,6 +324,7 @@ class AdminUser(BaseModel):
     email: str
     hashed_password: str
     active: bool = True
+    token_version: int = 0  # bumped to revoke every token issued before
     created_at: datetime = Field(default_factory=datetime.utcnow)
     last_login: Optional[datetime] = None
 
@@ -293,13 +338,63 @@ class AdminLogin(BaseModel):
     password: str
 
 # File Upload Models
+class ImageVariant(BaseModel):
+    filename: str
+    url: str
+    width: int
+    height: int
+    format: str
+    content_type: str
+    size: int
+
 class FileUpload(BaseModel):
     filename: str
     content_type: str
     size: int
     url: str
+    variants: List[ImageVariant] = []
     uploaded_at: datetime = Field(default_factory=datetime.utcnow)
 
+# Bulk content operations
+class BulkAction(str, Enum):
+    create = "create"
+    update = "update"
+    delete = "delete"
+    reorder = "reorder"
+
+class BulkOperation(BaseModel):
+    action: BulkAction
+    id: Optional[str] = None  # required for update, delete and reorder
+    data: Optional[Dict[str, Any]] = None  # create/update payload
+    order: Optional[int] = None  # new position for reorder
+
+class BulkRequest(BaseModel):
+    operations: List[BulkOperation]
+
+class BulkItemResult(BaseModel):
+    index: int
+    action: BulkAction
+    id: Optional[str] = None
+    success: bool
+    error: Optional[str] = None
+
+class BulkResult(BaseModel):
+    success: bool
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    failed: int = 0
+    results: List[BulkItemResult]
+
+# Paginated list (keyset cursor)
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+    total_estimate: Optional[int] = None  # None where no cheap estimate exists (search)
+    truncated: bool = False  # More matches exist than a search loads (MAX_FIND_RESULTS)
+
 # Response Models
 class MessageResponse(BaseModel):
     message: str
@@ -322,4 +417,16 @@ class LeadStats(BaseModel):
     in_progress: int
     completed: int
     rejected: int
-    total: int
\ No newline at end of file
+    total: int
+
+class ContentCount(BaseModel):
+    total: int
+    active: int
+
+class DashboardOverview(BaseModel):
+    stats: DashboardStats
+    lead_stats: LeadStats
+    leads_last_7_days: int
+    content: Dict[str, ContentCount]
+    recent_leads: List[Lead]
+    recent_uploads: List[FileUpload]
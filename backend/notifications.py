@@ -0,0 +1,237 @@
+import asyncio
+import logging
+import os
+import smtplib
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from email.message import EmailMessage
+from typing import Any, Dict, List, Optional
+
+import requests
+from bson import json_util
+
+logger = logging.getLogger(__name__)
+
+# Dispatcher settings
+NOTIFY_QUEUE_SIZE = int(os.environ.get("NOTIFY_QUEUE_SIZE", 1000))
+NOTIFY_WORKERS = int(os.environ.get("NOTIFY_WORKERS", 2))
+NOTIFY_DIGEST_WINDOW = float(os.environ.get("NOTIFY_DIGEST_WINDOW", 10))  # seconds
+NOTIFY_DIGEST_MAX = int(os.environ.get("NOTIFY_DIGEST_MAX", 50))
+NOTIFY_MAX_ATTEMPTS = int(os.environ.get("NOTIFY_MAX_ATTEMPTS", 5))
+NOTIFY_RETRY_DELAY = float(os.environ.get("NOTIFY_RETRY_DELAY", 5))  # seconds, doubled per attempt
+
+# Fields listed in a notification: (label, lead field)
+LEAD_SUMMARY_FIELDS = [
+    ("Ім'я", "name"),
+    ("Телефон", "phone"),
+    ("Email", "email"),
+    ("Об'єкт", "object_type"),
+    ("Площа, м²", "area"),
+    ("Паливо", "current_fuel"),
+    ("Терміни", "timeline"),
+    ("Повідомлення", "message"),
+]
+
+def _text(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return ", ".join(_text(item) for item in value)
+    return str(getattr(value, "value", value)) if value is not None else "—"
+
+def lead_summary(lead: dict) -> str:
+    """Plain text description of one lead"""
+    return "\n".join(f"{label}: {_text(lead.get(field))}" for label, field in LEAD_SUMMARY_FIELDS)
+
+class NotificationChannel(ABC):
+    """Delivers a digest of new leads; send() blocks and runs in a worker thread"""
+
+    name = "channel"
+
+    @abstractmethod
+    def send(self, leads: List[dict]):
+        """Deliver the digest, raising if it should be retried"""
+
+class EmailChannel(NotificationChannel):
+    """Email through an SMTP server (SMTP_HOST/SMTP_PORT, any local SMTP stand-in works)"""
+
+    name = "email"
+
+    def __init__(self, host: str, port: int, sender: str, recipients: List[str],
+                 username: str = None, password: str = None, starttls: bool = False, timeout: float = 10):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = recipients
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def build_message(self, leads: List[dict]) -> EmailMessage:
+        message = EmailMessage()
+        if len(leads) == 1:
+            message["Subject"] = f"Нова заявка: {_text(leads[0].get('name'))}"
+        else:
+            message["Subject"] = f"Нові заявки: {len(leads)}"
+        message["From"] = self.sender
+        message["To"] = ", ".join(self.recipients)
+        message.set_content("\n\n".join(lead_summary(lead) for lead in leads))
+        return message
+
+    def send(self, leads: List[dict]):
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or "")
+            smtp.send_message(self.build_message(leads))
+
+class WebhookChannel(NotificationChannel):
+    """JSON POST of the digest to a URL"""
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = 10):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, leads: List[dict]):
+        response = requests.post(
+            self.url,
+            data=json_util.dumps({"event": "leads.created", "leads": leads}),
+            headers={"Content-Type": "application/json"},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+
+def channels_from_env() -> List[NotificationChannel]:
+    """Channels configured in the environment (none configured disables notifications)"""
+    channels = []
+    recipients = [email.strip() for email in os.environ.get("NOTIFY_EMAIL_TO", "").split(",") if email.strip()]
+    if recipients and os.environ.get("SMTP_HOST"):
+        channels.append(EmailChannel(
+            host=os.environ["SMTP_HOST"],
+            port=int(os.environ.get("SMTP_PORT", 25)),
+            sender=os.environ.get("SMTP_FROM", "noreply@komfort.city"),
+            recipients=recipients,
+            username=os.environ.get("SMTP_USER"),
+            password=os.environ.get("SMTP_PASSWORD"),
+            starttls=os.environ.get("SMTP_STARTTLS", "").lower() in ("1", "true", "yes")
+        ))
+    if os.environ.get("NOTIFY_WEBHOOK_URL"):
+        channels.append(WebhookChannel(os.environ["NOTIFY_WEBHOOK_URL"]))
+    return channels
+
+@dataclass
+class DeliveryJob:
+    channel: NotificationChannel
+    leads: List[dict]
+    attempt: int = 1
+
+class NotificationDispatcher:
+    """Sends new-lead notifications in the background.
+
+    notify() only puts the lead on a bounded queue. A batcher collects the leads
+    arriving within NOTIFY_DIGEST_WINDOW into one digest per channel and a fixed
+    pool of workers delivers the digests, retrying failures with exponential
+    backoff. When the queue is full new leads are counted as dropped rather
+    than slowing down the form.
+    """
+
+    def __init__(self, channels: List[NotificationChannel], workers: int = NOTIFY_WORKERS,
+                 queue_size: int = NOTIFY_QUEUE_SIZE, digest_window: float = NOTIFY_DIGEST_WINDOW):
+        self.channels = channels
+        self.workers = workers
+        self.digest_window = digest_window
+        self._queue: Optional[asyncio.Queue] = None
+        self._queue_size = queue_size
+        self._jobs: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._retrying = 0
+        self.counters = {"sent": 0, "failed": 0, "retried": 0, "dropped": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.channels)
+
+    def start(self):
+        """Start the batcher and the worker pool"""
+        if not self.enabled or self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._jobs = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._batch())]
+        self._tasks += [asyncio.create_task(self._work()) for _ in range(max(self.workers, 1))]
+        print(f"✅ Lead notifications: {', '.join(channel.name for channel in self.channels)}")
+
+    async def stop(self):
+        """Stop the background tasks (undelivered notifications are dropped)"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self, lead: dict):
+        """Queue a new lead for notification without waiting"""
+        if not self._tasks:
+            return
+        try:
+            self._queue.put_nowait(dict(lead))
+        except asyncio.QueueFull:
+            self.counters["dropped"] += 1
+            logger.warning("Notification queue full, lead notification dropped")
+
+    async def _batch(self):
+        while True:
+            leads = [await self._queue.get()]
+            deadline = time.monotonic() + self.digest_window
+            while len(leads) < NOTIFY_DIGEST_MAX:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    leads.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            for channel in self.channels:
+                self._jobs.put_nowait(DeliveryJob(channel, leads))
+
+    async def _work(self):
+        while True:
+            job = await self._jobs.get()
+            try:
+                await asyncio.to_thread(job.channel.send, job.leads)
+                self.counters["sent"] += 1
+            except Exception as e:
+                if job.attempt >= NOTIFY_MAX_ATTEMPTS:
+                    self.counters["failed"] += 1
+                    logger.error(f"{job.channel.name} notification of {len(job.leads)} leads failed: {e}")
+                else:
+                    delay = NOTIFY_RETRY_DELAY * 2 ** (job.attempt - 1)
+                    logger.warning(f"{job.channel.name} notification failed, retry in {delay}s: {e}")
+                    self.counters["retried"] += 1
+                    self._retry_later(DeliveryJob(job.channel, job.leads, job.attempt + 1), delay)
+
+    def _retry_later(self, job: DeliveryJob, delay: float):
+        self._retrying += 1
+
+        def requeue():
+            self._retrying -= 1
+            self._jobs.put_nowait(job)
+
+        asyncio.get_running_loop().call_later(delay, requeue)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and delivery counters"""
+        return {
+            "enabled": self.enabled,
+            "channels": [channel.name for channel in self.channels],
+            "workers": self.workers,
+            "queued_leads": self._queue.qsize() if self._queue else 0,
+            "queued_deliveries": self._jobs.qsize() if self._jobs else 0,
+            "retrying": self._retrying,
+            **self.counters
+        }
+
+# Dispatcher instance
+lead_notifications = NotificationDispatcher(channels_from_env())
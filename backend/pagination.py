@@ -0,0 +1,83 @@
+import base64
+import binascii
+from typing import Any, Callable, List, Optional, Tuple
+
+from bson import json_util
+from fastapi import HTTPException, Query
+
+from database import estimated_document_count, find_many_bounded
+
+# Page size limits
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def page_size(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)) -> int:
+    """Page size query parameter shared by paginated endpoints"""
+    return limit
+
+def encode_cursor(values: List[Any]) -> str:
+    """Opaque cursor from the sort key values of the last document of a page"""
+    return base64.urlsafe_b64encode(json_util.dumps(values).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Sort key values from a cursor; 400 if it was not issued for this sort"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def with_tiebreaker(sort_by: List[Tuple[str, int]]) -> List[Tuple[str, int]]:
+    """Append _id so the sort order is total (in the direction of the last key)"""
+    if sort_by and sort_by[-1][0] == "_id":
+        return list(sort_by)
+    direction = sort_by[-1][1] if sort_by else 1
+    return [*sort_by, ("_id", direction)]
+
+def keyset_filter(sort_by: List[Tuple[str, int]], values: List[Any]) -> dict:
+    """Filter matching the documents strictly after the cursor position"""
+    clauses = []
+    for position, (field, direction) in enumerate(sort_by):
+        clause = {previous: values[index] for index, (previous, _) in enumerate(sort_by[:position])}
+        clause[field] = {"$gt" if direction == 1 else "$lt": values[position]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+async def paginate(
+    collection_name: str,
+    filter_dict: dict,
+    sort_by: List[Tuple[str, int]],
+    cursor: Optional[str],
+    limit: int,
+    serialize: Callable[[dict], dict] = None
+) -> dict:
+    """One keyset page: items, next_cursor (None on the last page) and total_estimate.
+
+    Every page is an index range scan from the cursor position, so deep pages
+    cost the same as the first one. The total is the collection's metadata
+    count, not a count of the filtered documents.
+    """
+    sort_by = with_tiebreaker(sort_by)
+    page_filter = filter_dict or {}
+    if cursor:
+        after = keyset_filter(sort_by, decode_cursor(cursor, len(sort_by)))
+        page_filter = {"$and": [page_filter, after]} if page_filter else after
+
+    documents = await find_many_bounded(collection_name, page_filter, sort_by, limit + 1)
+    has_more = len(documents) > limit
+    documents = documents[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = documents[-1]
+        next_cursor = encode_cursor([last.get(field) for field, _ in sort_by])
+
+    return {
+        "items": [serialize(doc) for doc in documents] if serialize else documents,
+        "next_cursor": next_cursor,
+        "total_estimate": await estimated_document_count(collection_name)
+    }
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set
+
+from cache import on_invalidate
+
+logger = logging.getLogger(__name__)
+
+# Directory served as static files; empty disables publishing
+STATIC_CONTENT_DIR = os.environ.get("STATIC_CONTENT_DIR", "/app/static-content")
+
+def write_atomic(path: Path, data: bytes):
+    """Write a file so readers only ever see the old or the new complete version"""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as buffer:
+        buffer.write(data)
+        buffer.flush()
+        os.fsync(buffer.fileno())
+    os.replace(tmp_path, path)
+
+class StaticPublisher:
+    """Exports public content as static JSON files whenever it changes.
+
+    The render callable returns the files (name -> bytes) affected by a change
+    to one collection. Changes arriving while a publish is running are merged
+    into a single follow-up publish.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str],
+        render: Callable[[str], Awaitable[Dict[str, bytes]]],
+        collection_names: Iterable[str]
+    ):
+        self.directory = Path(directory) if directory else None
+        self._render = render
+        self.collection_names = set(collection_names)
+        self._pending: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+        on_invalidate(self.schedule)
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    async def publish(self, collection_name: str):
+        """Render and write the files of one collection"""
+        files = await self._render(collection_name)
+        await asyncio.to_thread(self._write_files, files)
+
+    async def publish_all(self):
+        """Write the files of every public collection"""
+        if not self.enabled:
+            return
+        await asyncio.to_thread(self.directory.mkdir, parents=True, exist_ok=True)
+        for collection_name in sorted(self.collection_names):
+            await self.publish(collection_name)
+        logger.info(f"Static content published to {self.directory}")
+
+    def _write_files(self, files: Dict[str, bytes]):
+        for filename, data in files.items():
+            write_atomic(self.directory / filename, data)
+
+    def schedule(self, collection_name: str):
+        """Queue a collection for publishing in the background"""
+        if not self.enabled or collection_name not in self.collection_names:
+            return
+
+        self._pending.add(collection_name)
+        if self._task is None or self._task.done():
+            try:
+                self._task = asyncio.get_running_loop().create_task(self._drain())
+            except RuntimeError:
+                pass  # Published on the next startup
+
+    async def _drain(self):
+        while self._pending:
+            collection_name = self._pending.pop()
+            try:
+                await self.publish(collection_name)
+            except Exception as e:
+                logger.warning(f"Static publish failed for {collection_name}: {e}")
@@ -0,0 +1,176 @@
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from database import Collections, find_one, find_one_and_update
+
+logger = logging.getLogger(__name__)
+
+# memory (per worker) or mongo (shared by all workers)
+RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_MAX_KEYS = int(os.environ.get("RATE_LIMIT_MAX_KEYS", 10000))
+# Take the client address from X-Forwarded-For (only behind a trusted proxy)
+RATE_LIMIT_TRUST_PROXY = os.environ.get("RATE_LIMIT_TRUST_PROXY", "").lower() in ("1", "true", "yes")
+# Number of trusted proxies appending to X-Forwarded-For in front of the app
+RATE_LIMIT_PROXY_HOPS = int(os.environ.get("RATE_LIMIT_PROXY_HOPS", 1))
+
+@dataclass(frozen=True)
+class RatePolicy:
+    name: str
+    limit: int  # requests allowed per window
+    window: float  # seconds
+
+    @classmethod
+    def from_env(cls, name: str, default: str) -> "RatePolicy":
+        """Policy from RATE_LIMIT_<NAME> written as "<requests>/<seconds>" """
+        value = os.environ.get(f"RATE_LIMIT_{name.upper()}", default)
+        limit, window = value.split("/")
+        return cls(name, int(limit), float(window))
+
+# Per-route policies
+POLICIES = {
+    policy.name: policy for policy in [
+        RatePolicy.from_env("contact_form_ip", "5/60"),
+        RatePolicy.from_env("login_ip", "10/300"),
+        RatePolicy.from_env("login_username", "5/300"),
+    ]
+}
+
+class MemoryBackend:
+    """Token buckets held in the worker, oldest keys evicted over RATE_LIMIT_MAX_KEYS"""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[Tuple[str, str], Tuple[float, float]]" = OrderedDict()
+
+    def _tokens(self, policy: RatePolicy, bucket_key: Tuple[str, str], now: float) -> float:
+        tokens, updated = self._buckets.get(bucket_key, (policy.limit, now))
+        return min(policy.limit, tokens + (now - updated) * policy.limit / policy.window)
+
+    async def peek(self, policy: RatePolicy, key: str) -> float:
+        """Seconds until a token is available, without taking one"""
+        tokens = self._tokens(policy, (policy.name, key), time.monotonic())
+        return 0.0 if tokens >= 1 else (1 - tokens) * policy.window / policy.limit
+
+    async def hit(self, policy: RatePolicy, key: str) -> float:
+        """Take a token; seconds until one is available if the bucket is empty"""
+        now = time.monotonic()
+        rate = policy.limit / policy.window
+        bucket_key = (policy.name, key)
+        tokens = self._tokens(policy, bucket_key, now)
+
+        if tokens >= 1:
+            self._buckets[bucket_key] = (tokens - 1, now)
+            retry_after = 0.0
+        else:
+            self._buckets[bucket_key] = (tokens, now)
+            retry_after = (1 - tokens) / rate
+
+        self._buckets.move_to_end(bucket_key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+class MongoBackend:
+    """Fixed-window counters in Mongo, shared by every worker (expired by a TTL index)"""
+
+    @staticmethod
+    def _window(policy: RatePolicy, key: str, now: float) -> Tuple[str, float]:
+        window_start = math.floor(now / policy.window) * policy.window
+        return f"{policy.name}:{key}:{int(window_start)}", window_start + policy.window
+
+    async def peek(self, policy: RatePolicy, key: str) -> float:
+        now = time.time()
+        counter_id, window_end = self._window(policy, key, now)
+        counter = await find_one(Collections.RATE_LIMITS, {"_id": counter_id})
+        if counter is not None and counter["count"] >= policy.limit:
+            return window_end - now
+        return 0.0
+
+    async def hit(self, policy: RatePolicy, key: str) -> float:
+        now = time.time()
+        counter_id, window_end = self._window(policy, key, now)
+        counter = await find_one_and_update(
+            Collections.RATE_LIMITS,
+            {"_id": counter_id},
+            {
+                "$inc": {"count": 1},
+                "$setOnInsert": {"expires_at": datetime.utcfromtimestamp(window_end) + timedelta(seconds=60)}
+            },
+            upsert=True
+        )
+        if counter["count"] > policy.limit:
+            return window_end - now
+        return 0.0
+
+def backend_from_env():
+    """Rate limit backend selected by RATE_LIMIT_BACKEND"""
+    if RATE_LIMIT_BACKEND == "mongo":
+        return MongoBackend()
+    if RATE_LIMIT_BACKEND != "memory":
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {RATE_LIMIT_BACKEND}")
+    return MemoryBackend()
+
+class RateLimiter:
+    """Applies the named policies and turns exhausted limits into 429 responses"""
+
+    def __init__(self, policies: Dict[str, RatePolicy], backend):
+        self.policies = policies
+        self.backend = backend
+        self.rejected: Dict[str, int] = {}
+
+    async def _call(self, operation: str, policy_name: str, key: str) -> float:
+        try:
+            return await getattr(self.backend, operation)(self.policies[policy_name], key)
+        except Exception as e:
+            # An unavailable shared backend must not lock everybody out
+            logger.warning(f"Rate limit check {policy_name} failed, allowing request: {e}")
+            return 0.0
+
+    async def check(self, policy_name: str, key: str):
+        """Count a request; raise 429 with Retry-After if the policy is exhausted"""
+        self._reject_if_limited(policy_name, await self._call("hit", policy_name, key))
+
+    async def check_available(self, policy_name: str, key: str):
+        """Raise 429 if the policy is exhausted, without counting this request"""
+        self._reject_if_limited(policy_name, await self._call("peek", policy_name, key))
+
+    async def charge(self, policy_name: str, key: str):
+        """Count a request (e.g. a failed attempt) without rejecting it"""
+        await self._call("hit", policy_name, key)
+
+    def _reject_if_limited(self, policy_name: str, retry_after: float):
+        if retry_after > 0:
+            self.rejected[policy_name] = self.rejected.get(policy_name, 0) + 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+            )
+
+def client_ip(request: Request) -> str:
+    """Client address used as the rate limit key"""
+    if RATE_LIMIT_TRUST_PROXY:
+        # Proxies append the address they saw, so only the rightmost entries are
+        # trustworthy; anything further left was sent by the client itself
+        addresses = [address.strip() for address in request.headers.get("x-forwarded-for", "").split(",")]
+        addresses = [address for address in addresses if address]
+        if len(addresses) >= RATE_LIMIT_PROXY_HOPS > 0:
+            return addresses[-RATE_LIMIT_PROXY_HOPS]
+    return request.client.host if request.client else "unknown"
+
+# Limiter instance
+rate_limiter = RateLimiter(POLICIES, backend_from_env())
+
+def rate_limit(policy_name: str) -> Callable:
+    """Dependency limiting a route per client IP"""
+    async def dependency(request: Request):
+        await rate_limiter.check(policy_name, client_ip(request))
+    return dependency
@@ -0,0 +1,136 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import DeleteMany, ReplaceOne, UpdateOne
+
+from database import Collections, bulk_write, count_documents, find_many, iter_batches
+
+logger = logging.getLogger(__name__)
+
+# Lead fields broken down in every bucket
+ROLLUP_DIMENSIONS = ["object_type", "current_fuel", "timeline", "status"]
+
+def _value(value: Any) -> str:
+    return str(getattr(value, "value", value))
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Timestamp as naive UTC, the form created_at and the rollup days are stored in"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+def day_start(value: datetime) -> datetime:
+    """Start of the (UTC) day of a timestamp"""
+    return datetime(value.year, value.month, value.day)
+
+def week_start(value: datetime) -> datetime:
+    """Monday of the (UTC) week of a timestamp"""
+    return day_start(value) - timedelta(days=value.weekday())
+
+def empty_bucket(start: datetime) -> dict:
+    return {"start": start, "count": 0, "area": 0.0, **{dimension: {} for dimension in ROLLUP_DIMENSIONS}}
+
+def add_bucket(bucket: dict, other: dict):
+    """Add the counters of a rollup document or bucket to a bucket"""
+    bucket["count"] += other.get("count", 0)
+    bucket["area"] += other.get("area", 0)
+    for dimension in ROLLUP_DIMENSIONS:
+        for value, amount in other.get(dimension, {}).items():
+            bucket[dimension][value] = bucket[dimension].get(value, 0) + amount
+
+def lead_increments(lead: dict) -> Dict[str, float]:
+    """$inc document adding one lead to its daily bucket"""
+    increments = {"count": 1, "area": float(lead.get("area") or 0)}
+    for dimension in ROLLUP_DIMENSIONS:
+        if lead.get(dimension) is not None:
+            increments[f"{dimension}.{_value(lead[dimension])}"] = 1
+    return increments
+
+def _merge(increments: Dict[str, float], into: Dict[str, float]):
+    for key, amount in increments.items():
+        into[key] = into.get(key, 0) + amount
+
+async def record_leads(leads: Iterable[dict]):
+    """Add newly inserted leads to the daily rollups (one upsert per day touched)"""
+    by_day: Dict[datetime, Dict[str, float]] = defaultdict(dict)
+    for lead in leads:
+        _merge(lead_increments(lead), by_day[day_start(lead["created_at"])])
+    if not by_day:
+        return
+
+    try:
+        await bulk_write(Collections.LEAD_ROLLUPS, [
+            UpdateOne({"_id": day}, {"$inc": increments}, upsert=True)
+            for day, increments in by_day.items()
+        ])
+    except Exception as e:
+        # The leads are stored; rebuild_rollups() restores the counters
+        logger.error(f"Failed to update lead rollups: {e}")
+
+async def record_status_change(lead: dict, old_status: Any, new_status: Any):
+    """Move a lead between status counters of its creation day"""
+    if _value(old_status) == _value(new_status):
+        return
+    try:
+        await bulk_write(Collections.LEAD_ROLLUPS, [
+            UpdateOne(
+                {"_id": day_start(lead["created_at"])},
+                {"$inc": {f"status.{_value(old_status)}": -1, f"status.{_value(new_status)}": 1}},
+                upsert=True
+            )
+        ])
+    except Exception as e:
+        logger.error(f"Failed to update lead rollups: {e}")
+
+async def rebuild_rollups() -> int:
+    """Recompute every daily bucket from the leads collection.
+
+    Leads inserted while the rebuild runs may be counted twice or not at all
+    for their day; run it when the counters are known to be off.
+    """
+    by_day: Dict[datetime, Dict[str, float]] = defaultdict(dict)
+    async for batch in iter_batches(
+        Collections.LEADS,
+        projection={"created_at": 1, "area": 1, **{dimension: 1 for dimension in ROLLUP_DIMENSIONS}}
+    ):
+        for lead in batch:
+            if isinstance(lead.get("created_at"), datetime):
+                _merge(lead_increments(lead), by_day[day_start(lead["created_at"])])
+
+    requests = []
+    for day, increments in by_day.items():
+        document = {"count": 0, "area": 0.0}
+        for key, amount in increments.items():
+            if "." in key:
+                dimension, value = key.split(".", 1)
+                document.setdefault(dimension, {})[value] = amount
+            else:
+                document[key] = amount
+        requests.append(ReplaceOne({"_id": day}, document, upsert=True))
+
+    requests.append(DeleteMany({"_id": {"$nin": list(by_day)}}))
+    await bulk_write(Collections.LEAD_ROLLUPS, requests, ordered=True)
+    print(f"✅ Lead rollups rebuilt ({len(by_day)} days)")
+    return len(by_day)
+
+async def backfill_rollups():
+    """Build the rollups on first start with existing leads"""
+    if await count_documents(Collections.LEAD_ROLLUPS) == 0 and await count_documents(Collections.LEADS) > 0:
+        await rebuild_rollups()
+
+async def lead_analytics(date_from: datetime, date_to: datetime, granularity: str = "day") -> List[dict]:
+    """Buckets between two dates from the daily rollups, merged per week if asked"""
+    days = await find_many(
+        Collections.LEAD_ROLLUPS,
+        {"_id": {"$gte": day_start(date_from), "$lt": date_to}},
+        [("_id", 1)]
+    )
+
+    bucket_start = week_start if granularity == "week" else day_start
+    buckets: Dict[datetime, dict] = {}
+    for day in days:
+        start = bucket_start(day["_id"])
+        add_bucket(buckets.setdefault(start, empty_bucket(start)), day)
+    return list(buckets.values())
@@ -1,18 +1,30 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.security import HTTPAuthorizationCredentials
-from datetime import timedelta
+from datetime import datetime, timedelta
+from jose import jwt
 
 from models import AdminLogin, AdminUser, MessageResponse
-from auth import auth_manager, get_current_admin_user, ACCESS_TOKEN_EXPIRE_MINUTES
+from auth import (
+    auth_manager, get_current_admin_user, invalidate_admin_users, revoked_tokens, security,
+    ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, SECRET_KEY
+)
+from ratelimit import rate_limit, rate_limiter
+from passwords import password_pool
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
-@router.post("/login")
+@router.post("/login", dependencies=[Depends(rate_limit("login_ip"))])
 async def login(login_data: AdminLogin):
     """Admin login endpoint"""
+    # Throttled per IP and per username before the user lookup and bcrypt verify;
+    # only failed attempts count against the username, so others cannot lock it out
+    # by spending its budget
+    username_key = login_data.username.strip().lower()
+    await rate_limiter.check_available("login_username", username_key)
     user = await auth_manager.authenticate_user(login_data.username, login_data.password)
     
     if not user:
+        await rate_limiter.charge("login_username", username_key)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -21,7 +33,7 @@ async def login(login_data: AdminLogin):
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = auth_manager.create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={"sub": user.username, "ver": user.token_version}, expires_delta=access_token_expires
     )
     
     return {
@@ -36,10 +48,15 @@ async def login(login_data: AdminLogin):
     }
 
 @router.post("/logout")
-async def logout(current_user: AdminUser = Depends(get_current_admin_user)):
-    """Admin logout endpoint"""
-    # In a more sophisticated setup, you would invalidate the token
-    # For now, we just return a success message
+async def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: AdminUser = Depends(get_current_admin_user)
+):
+    """Admin logout endpoint: revokes the token until it expires"""
+    payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+    # Tokens issued before token ids existed cannot be revoked and simply expire
+    if payload.get("jti"):
+        await revoked_tokens.revoke(payload["jti"], datetime.utcfromtimestamp(payload["exp"]))
     return MessageResponse(message="Successfully logged out")
 
 @router.get("/me")
@@ -70,32 +87,53 @@ async def change_password(
         )
     
     # Verify current password
-    if not auth_manager.verify_password(current_password, current_user.hashed_password):
+    if not await auth_manager.verify_password_async(current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
     
-    # Hash new password and update
-    from database import update_one, Collections
+    # Hash new password and update; bumping token_version revokes every older token
+    from database import find_one_and_update, Collections
     from bson import ObjectId
     from datetime import datetime
     
-    new_hashed_password = auth_manager.get_password_hash(new_password)
+    new_hashed_password = await auth_manager.get_password_hash_async(new_password)
     
-    result = await update_one(
+    updated_user = await find_one_and_update(
         Collections.ADMIN_USERS,
         {"_id": ObjectId(current_user.id)},
         {
-            "hashed_password": new_hashed_password,
-            "updated_at": datetime.utcnow()
+            "$set": {"hashed_password": new_hashed_password, "updated_at": datetime.utcnow()},
+            "$inc": {"token_version": 1}
         }
     )
+    invalidate_admin_users()
     
-    if result.modified_count == 0:
+    if updated_user is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update password"
         )
     
-    return MessageResponse(message="Password changed successfully")
\ No newline at end of file
+    # The current session continues with a token of the new version
+    access_token = auth_manager.create_access_token(
+        data={"sub": updated_user["username"], "ver": updated_user["token_version"]},
+        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    
+    return {
+        "message": "Password changed successfully",
+        "success": True,
+        "access_token": access_token,
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    }
+
+@router.get("/security/stats")
+async def get_security_stats(current_user: AdminUser = Depends(get_current_admin_user)):
+    """Password hashing pool and rate limiter metrics"""
+    return {
+        "password_pool": password_pool.stats(),
+        "rate_limit_rejections": rate_limiter.rejected
+    }
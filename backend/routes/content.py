@@ -1,7 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from typing import Iterable, List, Optional, Tuple
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from bson import ObjectId
+from pydantic import ValidationError
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+import asyncio
+import hashlib
 
 from models import (
     Service, ServiceCreate, ServiceUpdate,
@@ -11,9 +19,14 @@ from models import (
     Project, ProjectCreate, ProjectUpdate,
     FAQ, FAQCreate, FAQUpdate,
     SiteInfo, SiteInfoUpdate,
-    AdminUser, MessageResponse
+    AdminUser, MessageResponse, Language, MultilingualText,
+    BulkAction, BulkOperation, BulkRequest, BulkItemResult, BulkResult, Page
 )
-from database import Collections, find_many, find_one, insert_one, update_one, delete_one
+from database import Collections, find_many, find_one, insert_one, update_one, delete_one, bulk_write
+from cache import cached_find_many, cached_find_one, content_versions, invalidate_collection
+from snapshots import SnapshotStore, encode_json
+from publisher import STATIC_CONTENT_DIR, StaticPublisher
+from pagination import page_size, paginate
 from auth import get_current_admin_user
 
 router = APIRouter(prefix="/api", tags=["content"])
@@ -25,14 +38,245 @@ def serialize_doc(doc):
         del doc["_id"]
     return doc
 
+def content_etag(collection_names: Iterable[str], variant: str = "") -> str:
+    """Strong ETag from the collection versions and the response variant"""
+    digest = hashlib.sha1(variant.encode()).hexdigest()[:8]
+    return f'"{content_versions.tag(collection_names)}-{digest}"'
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against the current validators"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        # HTTP dates have second precision
+        return last_modified.replace(microsecond=0) <= since
+
+    return False
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> dict:
+    """ETag, Last-Modified and Cache-Control headers for a content response"""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+    return headers
+
+def check_not_modified(request: Request, collection_names: List[str], variant: str = "") -> Tuple[str, Optional[Response]]:
+    """ETag for the request plus a 304 response when the client copy is current.
+
+    The ETag is taken before any read, so a write racing with the read can only
+    make the client revalidate again, never pin stale content to a new tag.
+    """
+    etag = content_etag(collection_names, variant)
+    last_modified = content_versions.last_modified(collection_names)
+    if is_not_modified(request, etag, last_modified):
+        return etag, Response(status_code=304, headers=validator_headers(etag, last_modified))
+    return etag, None
+
+def localize_doc(doc, lang: Language):
+    """Flatten multilingual fields of a serialized document to a single language"""
+    languages = {language.value for language in Language}
+    for key, value in doc.items():
+        if isinstance(value, dict) and value and languages.issuperset(value):
+            doc[key] = value.get(lang.value)
+    return doc
+
+# Sort order of the public collections
+PUBLIC_SORTS = {
+    Collections.SERVICES: [("order", 1), ("created_at", 1)],
+    Collections.SECTORS: [("order", 1), ("created_at", 1)],
+    Collections.ADVANTAGES: [("order", 1), ("created_at", 1)],
+    Collections.SOLUTIONS: [("order", 1), ("created_at", 1)],
+    Collections.PROJECTS: [("order", 1), ("created_at", -1)],
+    Collections.FAQ: [("order", 1), ("created_at", 1)],
+}
+
+# Public content models, used to validate ?fields= and to find multilingual fields
+PUBLIC_MODELS = {
+    Collections.SERVICES: Service,
+    Collections.SECTORS: Sector,
+    Collections.ADVANTAGES: Advantage,
+    Collections.SOLUTIONS: Solution,
+    Collections.PROJECTS: Project,
+    Collections.FAQ: FAQ,
+}
+
+def multilingual_fields(collection_name: str) -> List[str]:
+    """Names of the MultilingualText fields of a public collection"""
+    model = PUBLIC_MODELS[collection_name]
+    return [
+        name for name, field in model.model_fields.items()
+        if field.annotation is MultilingualText
+    ]
+
+def build_projection(collection_name: str, lang: Optional[Language] = None, fields: Optional[str] = None) -> Optional[dict]:
+    """Build the Mongo projection for the ?lang= and ?fields= query parameters"""
+    translated = multilingual_fields(collection_name)
+
+    if fields:
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        allowed = set(PUBLIC_MODELS[collection_name].model_fields)
+        unknown = [field for field in requested if field not in allowed]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+        projection = {}
+        for field in requested:
+            if field == "id":
+                continue  # _id is always returned
+            if lang and field in translated:
+                projection[f"{field}.{lang.value}"] = 1
+            else:
+                projection[field] = 1
+        return projection or {"_id": 1}
+
+    if lang:
+        return {
+            f"{field}.{other.value}": 0
+            for field in translated
+            for other in Language if other != lang
+        }
+
+    return None
+
+def public_doc(model, doc: dict) -> dict:
+    """Document reduced to the fields of its public model (defaults applied), id as a string"""
+    data = model.model_validate({key: value for key, value in doc.items() if key != "_id"})
+    return {"id": str(doc["_id"]), **data.model_dump(exclude={"id"})}
+
+async def build_snapshot(collection_name: str) -> dict:
+    """Encoded public responses of a collection: the full documents and one per language.
+
+    Snapshots are rebuilt right after writes and served (and published) under
+    the new version's ETag, so they read from the primary rather than a
+    possibly lagging secondary.
+    """
+    if collection_name == Collections.SITE_INFO:
+        site_info = await cached_find_one(Collections.SITE_INFO, {}, primary=True)
+        return {None: encode_json(public_doc(SiteInfo, site_info))} if site_info else {}
+
+    documents = await cached_find_many(
+        collection_name,
+        {"active": True},
+        PUBLIC_SORTS[collection_name],
+        primary=True
+    )
+    model = PUBLIC_MODELS[collection_name]
+    documents = [public_doc(model, doc) for doc in documents]
+
+    variants = {None: encode_json(documents)}
+    for lang in Language:
+        variants[lang] = encode_json([localize_doc(dict(doc), lang) for doc in documents])
+    return variants
+
+# Pre-encoded public responses, rebuilt after every content write
+snapshot_store = SnapshotStore(build_snapshot, [Collections.SITE_INFO, *PUBLIC_SORTS])
+
+async def list_public(
+    request: Request,
+    collection_name: str,
+    lang: Optional[Language] = None,
+    fields: Optional[str] = None
+):
+    """Active documents of a public collection, optionally projected and localized"""
+    projection = build_projection(collection_name, lang, fields)
+    etag, not_modified = check_not_modified(
+        request, [collection_name], f"{lang.value if lang else ''}|{fields or ''}"
+    )
+    if not_modified:
+        return not_modified
+
+    if not fields:
+        # Full documents are served straight from the snapshot bytes
+        body = await snapshot_store.get(collection_name, lang)
+        headers = validator_headers(etag, content_versions.last_modified([collection_name]))
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    # Served under the ETag of the version taken above, so read from the primary:
+    # a lagging secondary would pin its old documents to the new tag until the next write
+    documents = await cached_find_many(
+        collection_name,
+        {"active": True},
+        PUBLIC_SORTS[collection_name],
+        projection=projection,
+        primary=True
+    )
+    documents = [serialize_doc(doc) for doc in documents]
+    headers = validator_headers(etag, content_versions.last_modified([collection_name]))
+
+    if lang:
+        documents = [localize_doc(doc, lang) for doc in documents]
+    # Projected documents no longer match the response model, so skip its validation
+    return JSONResponse(content=jsonable_encoder(documents), headers=headers)
+
+async def build_bundle(lang: Optional[Language] = None) -> bytes:
+    """Encoded homepage bundle spliced from the snapshot bodies without re-encoding them"""
+    site_info, *collections = await asyncio.gather(
+        snapshot_store.get(Collections.SITE_INFO),
+        *[snapshot_store.get(name, lang) for name in PUBLIC_SORTS]
+    )
+
+    parts = [b'"site_info":' + (site_info or b"null")]
+    for name, body in zip(PUBLIC_SORTS, collections):
+        parts.append(encode_json(name) + b":" + body)
+    return b"{" + b",".join(parts) + b"}"
+
+async def render_static_files(collection_name: str) -> dict:
+    """Static JSON files affected by a change to a collection, including the bundles"""
+    files = {}
+    snapshot = await snapshot_store.rebuild(collection_name)
+    for lang, body in snapshot.variants.items():
+        suffix = f".{lang.value}" if lang else ""
+        files[f"{collection_name}{suffix}.json"] = body
+
+    for lang in [None, *Language]:
+        suffix = f".{lang.value}" if lang else ""
+        files[f"bundle{suffix}.json"] = await build_bundle(lang)
+    return files
+
+# Static JSON export of public content (STATIC_CONTENT_DIR, served at /content)
+content_publisher = StaticPublisher(
+    STATIC_CONTENT_DIR, render_static_files, [Collections.SITE_INFO, *PUBLIC_SORTS]
+)
+
+# Homepage bundle endpoint
+@router.get("/bundle")
+async def get_bundle(request: Request, lang: Optional[Language] = None):
+    """Get site info and all active public content in one response (public endpoint)"""
+    collection_names = [Collections.SITE_INFO, *PUBLIC_SORTS]
+    etag, not_modified = check_not_modified(
+        request, collection_names, lang.value if lang else ""
+    )
+    if not_modified:
+        return not_modified
+
+    body = await build_bundle(lang)
+    headers = validator_headers(etag, content_versions.last_modified(collection_names))
+    return Response(content=body, media_type="application/json", headers=headers)
+
 # Site Info endpoints
 @router.get("/site-info")
-async def get_site_info():
+async def get_site_info(request: Request):
     """Get site information (public endpoint)"""
-    site_info = await find_one(Collections.SITE_INFO, {})
-    if not site_info:
+    etag, not_modified = check_not_modified(request, [Collections.SITE_INFO])
+    if not_modified:
+        return not_modified
+
+    body = await snapshot_store.get(Collections.SITE_INFO)
+    if body is None:
         raise HTTPException(status_code=404, detail="Site info not found")
-    return serialize_doc(site_info)
+
+    headers = validator_headers(etag, content_versions.last_modified([Collections.SITE_INFO]))
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @router.put("/site-info")
 async def update_site_info(
@@ -44,6 +288,7 @@ async def update_site_info(
     update_data["updated_at"] = datetime.utcnow()
     
     result = await update_one(Collections.SITE_INFO, {}, update_data)
+    invalidate_collection(Collections.SITE_INFO)
     
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Site info not found or no changes made")
@@ -52,24 +297,29 @@ async def update_site_info(
 
 # Services endpoints
 @router.get("/services", response_model=List[Service])
-async def get_services():
+async def get_services(
+    request: Request,
+    lang: Optional[Language] = None,
+    fields: Optional[str] = None
+):
     """Get all active services (public endpoint)"""
-    services = await find_many(
-        Collections.SERVICES, 
-        {"active": True}, 
-        [("order", 1), ("created_at", 1)]
-    )
-    return [serialize_doc(service) for service in services]
+    return await list_public(request, Collections.SERVICES, lang, fields)
 
-@router.get("/admin/services", response_model=List[Service])
-async def get_all_services(current_user: AdminUser = Depends(get_current_admin_user)):
-    """Get all services for admin (admin only)"""
-    services = await find_many(
-        Collections.SERVICES, 
-        {}, 
-        [("order", 1), ("created_at", 1)]
+@router.get("/admin/services", response_model=Page[Service])
+async def get_all_services(
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
+    current_user: AdminUser = Depends(get_current_admin_user)
+):
+    """Get a page of services for admin (admin only)"""
+    return await paginate(
+        Collections.SERVICES,
+        {},
+        [("order", 1), ("created_at", 1)],
+        cursor,
+        limit,
+        serialize_doc
     )
-    return [serialize_doc(service) for service in services]
 
 @router.post("/services", response_model=Service)
 async def create_service(
@@ -82,6 +332,7 @@ async def create_service(
     service_data["updated_at"] = datetime.utcnow()
     
     result = await insert_one(Collections.SERVICES, service_data)
+    invalidate_collection(Collections.SERVICES)
     
     created_service = await find_one(Collections.SERVICES, {"_id": result.inserted_id})
     return serialize_doc(created_service)
@@ -104,6 +355,7 @@ async def update_service(
         {"_id": ObjectId(service_id)}, 
         update_data
     )
+    invalidate_collection(Collections.SERVICES)
     
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Service not found or no changes made")
@@ -120,6 +372,7 @@ async def delete_service(
         raise HTTPException(status_code=400, detail="Invalid service ID")
     
     result = await delete_one(Collections.SERVICES, {"_id": ObjectId(service_id)})
+    invalidate_collection(Collections.SERVICES)
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Service not found")
@@ -128,24 +381,29 @@ async def delete_service(
 
 # Sectors endpoints
 @router.get("/sectors", response_model=List[Sector])
-async def get_sectors():
+async def get_sectors(
+    request: Request,
+    lang: Optional[Language] = None,
+    fields: Optional[str] = None
+):
     """Get all active sectors (public endpoint)"""
-    sectors = await find_many(
-        Collections.SECTORS, 
-        {"active": True}, 
-        [("order", 1), ("created_at", 1)]
-    )
-    return [serialize_doc(sector) for sector in sectors]
+    return await list_public(request, Collections.SECTORS, lang, fields)
 
-@router.get("/admin/sectors", response_model=List[Sector])
-async def get_all_sectors(current_user: AdminUser = Depends(get_current_admin_user)):
-    """Get all sectors for admin (admin only)"""
-    sectors = await find_many(
-        Collections.SECTORS, 
-        {}, 
-        [("order", 1), ("created_at", 1)]
+@router.get("/admin/sectors", response_model=Page[Sector])
+async def get_all_sectors(
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
+    current_user: AdminUser = Depends(get_current_admin_user)
+):
+    """Get a page of sectors for admin (admin only)"""
+    return await paginate(
+        Collections.SECTORS,
+        {},
+        [("order", 1), ("created_at", 1)],
+        cursor,
+        limit,
+        serialize_doc
     )
-    return [serialize_doc(sector) for sector in sectors]
 
 @router.post("/sectors", response_model=Sector)
 async def create_sector(
@@ -158,6 +416,7 @@ async def create_sector(
     sector_data["updated_at"] = datetime.utcnow()
     
     result = await insert_one(Collections.SECTORS, sector_data)
+    invalidate_collection(Collections.SECTORS)
     
     created_sector = await find_one(Collections.SECTORS, {"_id": result.inserted_id})
     return serialize_doc(created_sector)
@@ -180,6 +439,7 @@ async def update_sector(
         {"_id": ObjectId(sector_id)}, 
         update_data
     )
+    invalidate_collection(Collections.SECTORS)
     
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Sector not found or no changes made")
@@ -196,6 +456,7 @@ async def delete_sector(
         raise HTTPException(status_code=400, detail="Invalid sector ID")
     
     result = await delete_one(Collections.SECTORS, {"_id": ObjectId(sector_id)})
+    invalidate_collection(Collections.SECTORS)
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Sector not found")
@@ -204,24 +465,29 @@ async def delete_sector(
 
 # Advantages endpoints
 @router.get("/advantages", response_model=List[Advantage])
-async def get_advantages():
+async def get_advantages(
+    request: Request,
+    lang: Optional[Language] = None,
+    fields: Optional[str] = None
+):
     """Get all active advantages (public endpoint)"""
-    advantages = await find_many(
-        Collections.ADVANTAGES, 
-        {"active": True}, 
-        [("order", 1), ("created_at", 1)]
-    )
-    return [serialize_doc(advantage) for advantage in advantages]
+    return await list_public(request, Collections.ADVANTAGES, lang, fields)
 
-@router.get("/admin/advantages", response_model=List[Advantage])
-async def get_all_advantages(current_user: AdminUser = Depends(get_current_admin_user)):
-    """Get all advantages for admin (admin only)"""
-    advantages = await find_many(
-        Collections.ADVANTAGES, 
-        {}, 
-        [("order", 1), ("created_at", 1)]
+@router.get("/admin/advantages", response_model=Page[Advantage])
+async def get_all_advantages(
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
+    current_user: AdminUser = Depends(get_current_admin_user)
+):
+    """Get a page of advantages for admin (admin only)"""
+    return await paginate(
+        Collections.ADVANTAGES,
+        {},
+        [("order", 1), ("created_at", 1)],
+        cursor,
+        limit,
+        serialize_doc
     )
-    return [serialize_doc(advantage) for advantage in advantages]
 
 @router.post("/advantages", response_model=Advantage)
 async def create_advantage(
@@ -234,6 +500,7 @@ async def create_advantage(
     advantage_data["updated_at"] = datetime.utcnow()
     
     result = await insert_one(Collections.ADVANTAGES, advantage_data)
+    invalidate_collection(Collections.ADVANTAGES)
     
     created_advantage = await find_one(Collections.ADVANTAGES, {"_id": result.inserted_id})
     return serialize_doc(created_advantage)
@@ -256,6 +523,7 @@ async def update_advantage(
         {"_id": ObjectId(advantage_id)}, 
         update_data
     )
+    invalidate_collection(Collections.ADVANTAGES)
     
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Advantage not found or no changes made")
@@ -272,6 +540,7 @@ async def delete_advantage(
         raise HTTPException(status_code=400, detail="Invalid advantage ID")
     
     result = await delete_one(Collections.ADVANTAGES, {"_id": ObjectId(advantage_id)})
+    invalidate_collection(Collections.ADVANTAGES)
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Advantage not found")
@@ -280,24 +549,29 @@ async def delete_advantage(
 
 # Solutions endpoints
 @router.get("/solutions", response_model=List[Solution])
-async def get_solutions():
+async def get_solutions(
+    request: Request,
+    lang: Optional[Language] = None,
+    fields: Optional[str] = None
+):
     """Get all active solutions (public endpoint)"""
-    solutions = await find_many(
-        Collections.SOLUTIONS, 
-        {"active": True}, 
-        [("order", 1), ("created_at", 1)]
-    )
-    return [serialize_doc(solution) for solution in solutions]
+    return await list_public(request, Collections.SOLUTIONS, lang, fields)
 
-@router.get("/admin/solutions", response_model=List[Solution])
-async def get_all_solutions(current_user: AdminUser = Depends(get_current_admin_user)):
-    """Get all solutions for admin (admin only)"""
-    solutions = await find_many(
-        Collections.SOLUTIONS, 
-        {}, 
-        [("order", 1), ("created_at", 1)]
+@router.get("/admin/solutions", response_model=Page[Solution])
+async def get_all_solutions(
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
+    current_user: AdminUser = Depends(get_current_admin_user)
+):
+    """Get a page of solutions for admin (admin only)"""
+    return await paginate(
+        Collections.SOLUTIONS,
+        {},
+        [("order", 1), ("created_at", 1)],
+        cursor,
+        limit,
+        serialize_doc
     )
-    return [serialize_doc(solution) for solution in solutions]
 
 @router.post("/solutions", response_model=Solution)
 async def create_solution(
@@ -310,6 +584,7 @@ async def create_solution(
     solution_data["updated_at"] = datetime.utcnow()
     
     result = await insert_one(Collections.SOLUTIONS, solution_data)
+    invalidate_collection(Collections.SOLUTIONS)
     
     created_solution = await find_one(Collections.SOLUTIONS, {"_id": result.inserted_id})
     return serialize_doc(created_solution)
@@ -332,6 +607,7 @@ async def update_solution(
         {"_id": ObjectId(solution_id)}, 
         update_data
     )
+    invalidate_collection(Collections.SOLUTIONS)
     
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Solution not found or no changes made")
@@ -348,6 +624,7 @@ async def delete_solution(
         raise HTTPException(status_code=400, detail="Invalid solution ID")
     
     result = await delete_one(Collections.SOLUTIONS, {"_id": ObjectId(solution_id)})
+    invalidate_collection(Collections.SOLUTIONS)
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Solution not found")
@@ -356,24 +633,29 @@ async def delete_solution(
 
 # Projects endpoints
 @router.get("/projects", response_model=List[Project])
-async def get_projects():
+async def get_projects(
+    request: Request,
+    lang: Optional[Language] = None,
+    fields: Optional[str] = None
+):
     """Get all active projects (public endpoint)"""
-    projects = await find_many(
-        Collections.PROJECTS, 
-        {"active": True}, 
-        [("order", 1), ("created_at", -1)]
-    )
-    return [serialize_doc(project) for project in projects]
+    return await list_public(request, Collections.PROJECTS, lang, fields)
 
-@router.get("/admin/projects", response_model=List[Project])
-async def get_all_projects(current_user: AdminUser = Depends(get_current_admin_user)):
-    """Get all projects for admin (admin only)"""
-    projects = await find_many(
-        Collections.PROJECTS, 
-        {}, 
-        [("order", 1), ("created_at", -1)]
+@router.get("/admin/projects", response_model=Page[Project])
+async def get_all_projects(
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
+    current_user: AdminUser = Depends(get_current_admin_user)
+):
+    """Get a page of projects for admin (admin only)"""
+    return await paginate(
+        Collections.PROJECTS,
+        {},
+        [("order", 1), ("created_at", -1)],
+        cursor,
+        limit,
+        serialize_doc
     )
-    return [serialize_doc(project) for project in projects]
 
 @router.post("/projects", response_model=Project)
 async def create_project(
@@ -386,6 +668,7 @@ async def create_project(
     project_data["updated_at"] = datetime.utcnow()
     
     result = await insert_one(Collections.PROJECTS, project_data)
+    invalidate_collection(Collections.PROJECTS)
     
     created_project = await find_one(Collections.PROJECTS, {"_id": result.inserted_id})
     return serialize_doc(created_project)
@@ -408,6 +691,7 @@ async def update_project(
         {"_id": ObjectId(project_id)}, 
         update_data
     )
+    invalidate_collection(Collections.PROJECTS)
     
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Project not found or no changes made")
@@ -424,6 +708,7 @@ async def delete_project(
         raise HTTPException(status_code=400, detail="Invalid project ID")
     
     result = await delete_one(Collections.PROJECTS, {"_id": ObjectId(project_id)})
+    invalidate_collection(Collections.PROJECTS)
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -432,24 +717,29 @@ async def delete_project(
 
 # FAQ endpoints
 @router.get("/faq", response_model=List[FAQ])
-async def get_faq():
+async def get_faq(
+    request: Request,
+    lang: Optional[Language] = None,
+    fields: Optional[str] = None
+):
     """Get all active FAQ (public endpoint)"""
-    faq = await find_many(
-        Collections.FAQ, 
-        {"active": True}, 
-        [("order", 1), ("created_at", 1)]
-    )
-    return [serialize_doc(item) for item in faq]
+    return await list_public(request, Collections.FAQ, lang, fields)
 
-@router.get("/admin/faq", response_model=List[FAQ])
-async def get_all_faq(current_user: AdminUser = Depends(get_current_admin_user)):
-    """Get all FAQ for admin (admin only)"""
-    faq = await find_many(
-        Collections.FAQ, 
-        {}, 
-        [("order", 1), ("created_at", 1)]
+@router.get("/admin/faq", response_model=Page[FAQ])
+async def get_all_faq(
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
+    current_user: AdminUser = Depends(get_current_admin_user)
+):
+    """Get a page of FAQ for admin (admin only)"""
+    return await paginate(
+        Collections.FAQ,
+        {},
+        [("order", 1), ("created_at", 1)],
+        cursor,
+        limit,
+        serialize_doc
     )
-    return [serialize_doc(item) for item in faq]
 
 @router.post("/faq", response_model=FAQ)
 async def create_faq(
@@ -462,6 +752,7 @@ async def create_faq(
     faq_data["updated_at"] = datetime.utcnow()
     
     result = await insert_one(Collections.FAQ, faq_data)
+    invalidate_collection(Collections.FAQ)
     
     created_faq = await find_one(Collections.FAQ, {"_id": result.inserted_id})
     return serialize_doc(created_faq)
@@ -484,6 +775,7 @@ async def update_faq(
         {"_id": ObjectId(faq_id)}, 
         update_data
     )
+    invalidate_collection(Collections.FAQ)
     
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="FAQ not found or no changes made")
@@ -500,8 +792,130 @@ async def delete_faq(
         raise HTTPException(status_code=400, detail="Invalid FAQ ID")
     
     result = await delete_one(Collections.FAQ, {"_id": ObjectId(faq_id)})
+    invalidate_collection(Collections.FAQ)
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="FAQ not found")
     
-    return MessageResponse(message="FAQ deleted successfully")
\ No newline at end of file
+    return MessageResponse(message="FAQ deleted successfully")
+
+# Bulk endpoints
+MAX_BULK_OPERATIONS = 500
+
+# Create and update models of the collections with a bulk endpoint
+BULK_MODELS = {
+    Collections.SERVICES: (ServiceCreate, ServiceUpdate),
+    Collections.SECTORS: (SectorCreate, SectorUpdate),
+    Collections.ADVANTAGES: (AdvantageCreate, AdvantageUpdate),
+    Collections.SOLUTIONS: (SolutionCreate, SolutionUpdate),
+    Collections.PROJECTS: (ProjectCreate, ProjectUpdate),
+    Collections.FAQ: (FAQCreate, FAQUpdate),
+}
+
+def build_bulk_request(operation: BulkOperation, create_model, update_model, existing_ids: set):
+    """Translate one bulk operation into a pymongo request; raises ValueError if invalid"""
+    now = datetime.utcnow()
+
+    if operation.action == BulkAction.create:
+        data = create_model(**(operation.data or {})).dict()
+        data["_id"] = ObjectId()
+        data["created_at"] = now
+        data["updated_at"] = now
+        return data["_id"], InsertOne(data)
+
+    if not operation.id or not ObjectId.is_valid(operation.id):
+        raise ValueError("Invalid ID")
+    object_id = ObjectId(operation.id)
+    if object_id not in existing_ids:
+        raise ValueError("Not found")
+
+    if operation.action == BulkAction.delete:
+        return object_id, DeleteOne({"_id": object_id})
+
+    if operation.action == BulkAction.reorder:
+        if operation.order is None:
+            raise ValueError("order is required for reorder")
+        update_data = {"order": operation.order}
+    else:
+        update_data = update_model(**(operation.data or {})).dict(exclude_unset=True)
+        if not update_data:
+            raise ValueError("No changes provided")
+
+    update_data["updated_at"] = now
+    return object_id, UpdateOne({"_id": object_id}, {"$set": update_data})
+
+async def apply_bulk(collection_name: str, bulk: BulkRequest) -> BulkResult:
+    """Validate bulk operations and apply the valid ones in a single bulk_write"""
+    if len(bulk.operations) > MAX_BULK_OPERATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maximum {MAX_BULK_OPERATIONS} operations allowed per bulk request"
+        )
+
+    create_model, update_model = BULK_MODELS[collection_name]
+
+    # One lookup tells which referenced documents exist
+    referenced_ids = [
+        ObjectId(operation.id) for operation in bulk.operations
+        if operation.action != BulkAction.create and operation.id and ObjectId.is_valid(operation.id)
+    ]
+    existing = await find_many(collection_name, {"_id": {"$in": referenced_ids}}, projection={"_id": 1}) if referenced_ids else []
+    existing_ids = {doc["_id"] for doc in existing}
+
+    results = []
+    requests = []
+    request_indexes = []  # position in bulk.operations of every request sent
+    for index, operation in enumerate(bulk.operations):
+        try:
+            object_id, request = build_bulk_request(operation, create_model, update_model, existing_ids)
+        except (ValidationError, ValueError) as e:
+            results.append(BulkItemResult(
+                index=index, action=operation.action, id=operation.id, success=False, error=str(e)
+            ))
+            continue
+
+        results.append(BulkItemResult(index=index, action=operation.action, id=str(object_id), success=True))
+        requests.append(request)
+        request_indexes.append(index)
+
+    if requests:
+        try:
+            await bulk_write(collection_name, requests, ordered=False)
+        except BulkWriteError as e:
+            for write_error in e.details.get("writeErrors", []):
+                item = results[request_indexes[write_error["index"]]]
+                item.success = False
+                item.error = write_error.get("errmsg", "Write failed")
+        finally:
+            # The whole batch invalidates cached content once
+            invalidate_collection(collection_name)
+
+    succeeded = [item for item in results if item.success]
+    return BulkResult(
+        success=len(succeeded) == len(results),
+        created=sum(1 for item in succeeded if item.action == BulkAction.create),
+        updated=sum(1 for item in succeeded if item.action in (BulkAction.update, BulkAction.reorder)),
+        deleted=sum(1 for item in succeeded if item.action == BulkAction.delete),
+        failed=len(results) - len(succeeded),
+        results=results
+    )
+
+def add_bulk_endpoint(collection_name: str):
+    """Register POST /api/<collection>/bulk for a content collection"""
+    async def bulk_endpoint(
+        bulk: BulkRequest,
+        current_user: AdminUser = Depends(get_current_admin_user)
+    ):
+        return await apply_bulk(collection_name, bulk)
+
+    bulk_endpoint.__doc__ = f"Bulk create, update, delete and reorder {collection_name} (admin only)"
+    router.add_api_route(
+        f"/{collection_name}/bulk",
+        bulk_endpoint,
+        methods=["POST"],
+        response_model=BulkResult,
+        name=f"bulk_{collection_name}"
+    )
+
+for bulk_collection in BULK_MODELS:
+    add_bulk_endpoint(bulk_collection)
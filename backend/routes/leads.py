@@ -1,14 +1,34 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List, Optional
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi.responses import StreamingResponse
+from typing import Dict, Optional
+from datetime import datetime, timedelta
 from bson import ObjectId
+import asyncio
+import logging
 
 from models import (
     Lead, LeadCreate, LeadUpdate, LeadStatus,
-    AdminUser, MessageResponse, DashboardStats, LeadStats
+    AdminUser, MessageResponse, DashboardStats, LeadStats,
+    ContentCount, DashboardOverview, Page, ExportFormat,
+    AnalyticsGranularity, LeadAnalytics, LeadDetail
+)
+from database import (
+    Collections, MAX_FIND_RESULTS, find_many_bounded, find_one, insert_one, find_one_and_update, aggregate,
+    iter_documents
 )
-from database import Collections, find_many, find_one, insert_one, update_one, count_documents
 from auth import get_current_admin_user
+from pagination import page_size, paginate, encode_cursor, decode_cursor
+from lead_search import search_fields, search_leads
+from ingest import lead_ingest
+from notifications import lead_notifications
+from ratelimit import rate_limit
+from matching import matching_engine
+from rollups import (
+    add_bucket, empty_bucket, lead_analytics, naive_utc, rebuild_rollups, record_leads, record_status_change
+)
+from exports import stream_csv, stream_xlsx
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["leads"])
 
@@ -20,18 +40,31 @@ def serialize_doc(doc):
     return doc
 
 # Contact form endpoint (public)
-@router.post("/contact-form", response_model=MessageResponse)
+@router.post("/contact-form", response_model=MessageResponse, dependencies=[Depends(rate_limit("contact_form_ip"))])
 async def submit_contact_form(lead: LeadCreate):
     """Submit contact form (public endpoint)"""
     lead_data = lead.dict()
     lead_data["status"] = LeadStatus.new
     lead_data["created_at"] = datetime.utcnow()
     lead_data["updated_at"] = datetime.utcnow()
+    lead_data.update(search_fields(lead_data))
+    # Uses the index in memory only; leads without matches (before the first
+    # index build) are filled in by POST /api/leads/matches/recompute
+    lead_data.update(matching_engine.match_fields(lead_data))
     
-    result = await insert_one(Collections.LEADS, lead_data)
+    inserted_id = None
+    if lead_ingest.running:
+        try:
+            inserted_id = await lead_ingest.submit(lead_data)
+        except OSError as e:
+            logger.error(f"Lead spool unavailable, writing directly: {e}")
+    if inserted_id is None:
+        result = await insert_one(Collections.LEADS, lead_data)
+        inserted_id = result.inserted_id
+        await record_leads([lead_data])
     
-    if result.inserted_id:
-        # Here you could add email notification logic
+    if inserted_id:
+        lead_notifications.notify(lead_data)
         return MessageResponse(
             message="Дякуємо! Ваша заявка відправлена. Ми зв'яжемося з вами найближчим часом.",
             success=True
@@ -42,33 +75,249 @@ async def submit_contact_form(lead: LeadCreate):
             detail="Failed to submit form"
         )
 
+def build_lead_filter(
+    status_filter: Optional[LeadStatus] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+) -> dict:
+    """Mongo filter for the status and created_at range filters"""
+    filter_dict = {}
+    if status_filter:
+        filter_dict["status"] = status_filter
+    
+    created_at = {}
+    if date_from:
+        created_at["$gte"] = date_from
+    if date_to:
+        created_at["$lt"] = date_to
+    if created_at:
+        filter_dict["created_at"] = created_at
+    
+    return filter_dict
+
 # Admin endpoints for managing leads
-@router.get("/leads", response_model=List[Lead])
+@router.get("/leads", response_model=Page[Lead])
 async def get_leads(
     status_filter: Optional[LeadStatus] = None,
-    limit: Optional[int] = 100,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
     current_user: AdminUser = Depends(get_current_admin_user)
 ):
-    """Get all leads with optional status filter (admin only)"""
-    filter_dict = {}
-    if status_filter:
-        filter_dict["status"] = status_filter
+    """Get a page of leads with optional status and date filters (admin only)"""
+    filter_dict = build_lead_filter(status_filter, date_from, date_to)
     
-    leads = await find_many(
+    return await paginate(
         Collections.LEADS,
         filter_dict,
         [("created_at", -1)],  # Sort by newest first
-        limit
+        cursor,
+        limit,
+        serialize_doc
     )
+
+@router.get("/leads/search", response_model=Page[Lead])
+async def search_leads_endpoint(
+    q: str = Query(..., min_length=2, max_length=100),
+    status_filter: Optional[LeadStatus] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
+    current_user: AdminUser = Depends(get_current_admin_user)
+):
+    """Search leads by phone fragment, email, name or message words (admin only)"""
+    offset = decode_cursor(cursor, 1)[0] if cursor else 0
+    if not isinstance(offset, int) or offset < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if offset >= MAX_FIND_RESULTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Search is limited to the first {MAX_FIND_RESULTS} matches, please refine the query"
+        )
+    
+    filter_dict = build_lead_filter(status_filter, date_from, date_to)
+    documents = await search_leads(q, filter_dict, min(offset + limit + 1, MAX_FIND_RESULTS))
+    page = documents[offset:offset + limit]
+    has_more = len(documents) > offset + limit
     
-    return [serialize_doc(lead) for lead in leads]
+    return {
+        "items": [serialize_doc(doc) for doc in page],
+        "next_cursor": encode_cursor([offset + limit]) if has_more else None,
+        "total_estimate": None,
+        # The lookups stop at MAX_FIND_RESULTS; say so instead of ending the pages silently
+        "truncated": not has_more and len(documents) >= MAX_FIND_RESULTS
+    }
+
+@router.get("/leads/export")
+async def export_leads(
+    export_format: ExportFormat = Query(ExportFormat.csv, alias="format"),
+    status_filter: Optional[LeadStatus] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    current_user: AdminUser = Depends(get_current_admin_user)
+):
+    """Export leads as CSV or XLSX, streamed straight from the cursor (admin only)"""
+    documents = iter_documents(
+        Collections.LEADS,
+        build_lead_filter(status_filter, date_from, date_to),
+        [("created_at", -1), ("_id", -1)]
+    )
+    
+    filename = f"leads-{datetime.utcnow():%Y%m%d-%H%M}.{export_format.value}"
+    if export_format == ExportFormat.xlsx:
+        body = stream_xlsx(documents)
+        media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    else:
+        body = stream_csv(documents)
+        media_type = "text/csv; charset=utf-8"
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/leads/analytics", response_model=LeadAnalytics)
+async def get_lead_analytics(
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    granularity: AnalyticsGranularity = AnalyticsGranularity.day,
+    current_user: AdminUser = Depends(get_current_admin_user)
+):
+    """Leads per day or week with breakdowns, read from the daily rollups (admin only)"""
+    # Query strings may carry an offset ("...+02:00"); rollup days are naive UTC
+    date_to = naive_utc(date_to) or datetime.utcnow()
+    date_from = naive_utc(date_from) or date_to - timedelta(days=30)
+    if date_from >= date_to:
+        raise HTTPException(status_code=400, detail="date_from must be before date_to")
+    
+    buckets = await lead_analytics(date_from, date_to, granularity.value)
+    totals = empty_bucket(None)
+    for bucket in buckets:
+        add_bucket(totals, bucket)
+    
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "granularity": granularity,
+        "buckets": buckets,
+        "totals": totals
+    }
+
+@router.post("/leads/analytics/rebuild", response_model=MessageResponse)
+async def rebuild_lead_analytics(current_user: AdminUser = Depends(get_current_admin_user)):
+    """Recompute the lead rollups from all leads (admin only)"""
+    days = await rebuild_rollups()
+    return MessageResponse(message=f"Lead analytics rebuilt ({days} days)")
+
+@router.post("/leads/matches/recompute", response_model=MessageResponse)
+async def recompute_lead_matches(current_user: AdminUser = Depends(get_current_admin_user)):
+    """Match every lead against the current solutions (admin only)"""
+    updated = await matching_engine.recompute_all()
+    return MessageResponse(message=f"Solution matches updated for {updated} leads")
+
+@router.get("/notifications/stats")
+async def get_notification_stats(current_user: AdminUser = Depends(get_current_admin_user)):
+    """Lead notification queue depth and delivery counters (admin only)"""
+    return lead_notifications.stats()
+
+# Content collections counted on the dashboard
+CONTENT_COLLECTIONS = [
+    Collections.SERVICES,
+    Collections.SECTORS,
+    Collections.ADVANTAGES,
+    Collections.SOLUTIONS,
+    Collections.PROJECTS,
+    Collections.FAQ,
+]
 
-@router.get("/leads/{lead_id}", response_model=Lead)
+RECENT_ITEMS_LIMIT = 5
+
+async def lead_status_counts(since: Optional[datetime] = None) -> dict:
+    """Lead counts per status plus the total (and leads since a date) in one aggregation"""
+    facets = {"by_status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}]}
+    if since:
+        facets["since"] = [{"$match": {"created_at": {"$gte": since}}}, {"$count": "count"}]
+
+    result = (await aggregate(Collections.LEADS, [{"$facet": facets}]))[0]
+    counts = {lead_status.value: 0 for lead_status in LeadStatus}
+    for row in result["by_status"]:
+        if row["_id"] in counts:
+            counts[row["_id"]] = row["count"]
+    counts["total"] = sum(row["count"] for row in result["by_status"])
+    if since:
+        counts["since"] = result["since"][0]["count"] if result["since"] else 0
+    return counts
+
+async def content_counts() -> Dict[str, ContentCount]:
+    """Total and active item counts of every content collection, queried concurrently"""
+    pipeline = [{"$group": {"_id": "$active", "count": {"$sum": 1}}}]
+    results = await asyncio.gather(*[aggregate(name, pipeline) for name in CONTENT_COLLECTIONS])
+
+    counts = {}
+    for name, rows in zip(CONTENT_COLLECTIONS, results):
+        counts[name] = ContentCount(
+            total=sum(row["count"] for row in rows),
+            active=sum(row["count"] for row in rows if row["_id"] is True)
+        )
+    return counts
+
+def build_dashboard_stats(lead_counts: dict, counts: Dict[str, ContentCount]) -> DashboardStats:
+    return DashboardStats(
+        total_leads=lead_counts["total"],
+        new_leads=lead_counts[LeadStatus.new.value],
+        completed_projects=counts[Collections.PROJECTS].active,
+        active_services=counts[Collections.SERVICES].active,
+        total_content_items=sum(count.total for count in counts.values())
+    )
+
+def build_lead_stats(lead_counts: dict) -> LeadStats:
+    return LeadStats(
+        new=lead_counts[LeadStatus.new.value],
+        in_progress=lead_counts[LeadStatus.in_progress.value],
+        completed=lead_counts[LeadStatus.completed.value],
+        rejected=lead_counts[LeadStatus.rejected.value],
+        total=lead_counts["total"]
+    )
+
+@router.get("/leads/stats", response_model=LeadStats)
+async def get_lead_stats(current_user: AdminUser = Depends(get_current_admin_user)):
+    """Get lead statistics (admin only)"""
+    return build_lead_stats(await lead_status_counts())
+
+@router.get("/dashboard/stats", response_model=DashboardStats)
+async def get_dashboard_stats(current_user: AdminUser = Depends(get_current_admin_user)):
+    """Get dashboard statistics (admin only)"""
+    lead_counts, counts = await asyncio.gather(lead_status_counts(), content_counts())
+    return build_dashboard_stats(lead_counts, counts)
+
+@router.get("/dashboard/overview", response_model=DashboardOverview)
+async def get_dashboard_overview(current_user: AdminUser = Depends(get_current_admin_user)):
+    """Get all dashboard data in one request (admin only)"""
+    lead_counts, counts, recent_leads, recent_uploads = await asyncio.gather(
+        lead_status_counts(since=datetime.utcnow() - timedelta(days=7)),
+        content_counts(),
+        find_many_bounded(Collections.LEADS, {}, [("created_at", -1)], RECENT_ITEMS_LIMIT),
+        find_many_bounded(Collections.UPLOADS, {}, [("uploaded_at", -1)], RECENT_ITEMS_LIMIT)
+    )
+
+    return DashboardOverview(
+        stats=build_dashboard_stats(lead_counts, counts),
+        lead_stats=build_lead_stats(lead_counts),
+        leads_last_7_days=lead_counts["since"],
+        content=counts,
+        recent_leads=[serialize_doc(lead) for lead in recent_leads],
+        recent_uploads=recent_uploads
+    )
+
+@router.get("/leads/{lead_id}", response_model=LeadDetail)
 async def get_lead(
     lead_id: str,
     current_user: AdminUser = Depends(get_current_admin_user)
 ):
-    """Get specific lead by ID (admin only)"""
+    """Get specific lead by ID with its matching solutions (admin only)"""
     if not ObjectId.is_valid(lead_id):
         raise HTTPException(status_code=400, detail="Invalid lead ID")
     
@@ -77,6 +326,7 @@ async def get_lead(
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
     
+    lead["matches"] = await matching_engine.match_lead(lead)
     return serialize_doc(lead)
 
 @router.put("/leads/{lead_id}/status")
@@ -92,56 +342,17 @@ async def update_lead_status(
     update_data = lead_update.dict(exclude_unset=True)
     update_data["updated_at"] = datetime.utcnow()
     
-    result = await update_one(
+    previous = await find_one_and_update(
         Collections.LEADS,
         {"_id": ObjectId(lead_id)},
-        update_data
+        {"$set": update_data},
+        return_new=False
     )
     
-    if result.modified_count == 0:
+    if previous is None:
         raise HTTPException(status_code=404, detail="Lead not found or no changes made")
     
-    return MessageResponse(message="Lead status updated successfully")
-
-@router.get("/leads/stats", response_model=LeadStats)
-async def get_lead_stats(current_user: AdminUser = Depends(get_current_admin_user)):
-    """Get lead statistics (admin only)"""
-    new_count = await count_documents(Collections.LEADS, {"status": LeadStatus.new})
-    in_progress_count = await count_documents(Collections.LEADS, {"status": LeadStatus.in_progress})
-    completed_count = await count_documents(Collections.LEADS, {"status": LeadStatus.completed})
-    rejected_count = await count_documents(Collections.LEADS, {"status": LeadStatus.rejected})
-    total_count = await count_documents(Collections.LEADS, {})
+    if "status" in update_data:
+        await record_status_change(previous, previous.get("status"), update_data["status"])
     
-    return LeadStats(
-        new=new_count,
-        in_progress=in_progress_count,
-        completed=completed_count,
-        rejected=rejected_count,
-        total=total_count
-    )
-
-@router.get("/dashboard/stats", response_model=DashboardStats)
-async def get_dashboard_stats(current_user: AdminUser = Depends(get_current_admin_user)):
-    """Get dashboard statistics (admin only)"""
-    total_leads = await count_documents(Collections.LEADS, {})
-    new_leads = await count_documents(Collections.LEADS, {"status": LeadStatus.new})
-    completed_projects = await count_documents(Collections.PROJECTS, {"active": True})
-    active_services = await count_documents(Collections.SERVICES, {"active": True})
-    
-    # Count total content items
-    total_content = (
-        await count_documents(Collections.SERVICES, {}) +
-        await count_documents(Collections.SECTORS, {}) +
-        await count_documents(Collections.ADVANTAGES, {}) +
-        await count_documents(Collections.SOLUTIONS, {}) +
-        await count_documents(Collections.PROJECTS, {}) +
-        await count_documents(Collections.FAQ, {})
-    )
-    
-    return DashboardStats(
-        total_leads=total_leads,
-        new_leads=new_leads,
-        completed_projects=completed_projects,
-        active_services=active_services,
-        total_content_items=total_content
-    )
\ No newline at end of file
+    return MessageResponse(message="Lead status updated successfully")
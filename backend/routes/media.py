@@ -1,25 +1,35 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, status
 from fastapi.responses import FileResponse
-from typing import List
+from typing import List, Optional
+import logging
+import mimetypes
 import os
 import uuid
 import shutil
 from pathlib import Path
 from datetime import datetime
 
-from models import AdminUser, FileUpload, MessageResponse
+from models import AdminUser, FileUpload, MessageResponse, Page
 from auth import get_current_admin_user
-from database import Collections, insert_one, find_many, delete_one, find_one
+from database import Collections, insert_one, delete_one, find_one
+from pagination import page_size, paginate
+from images import image_variants, remove_variants
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["media"])
 
+mimetypes.add_type("image/avif", ".avif")
+mimetypes.add_type("image/webp", ".webp")
+
 # Configuration
 UPLOAD_DIR = Path("/app/uploads")
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 
-# Ensure upload directory exists
-UPLOAD_DIR.mkdir(exist_ok=True)
+def ensure_upload_dir():
+    """Create the upload directory (called at startup, not at import)"""
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 def is_allowed_file(filename: str) -> bool:
     """Check if file extension is allowed"""
@@ -31,6 +41,14 @@ def generate_unique_filename(original_filename: str) -> str:
     unique_id = str(uuid.uuid4())
     return f"{unique_id}{file_ext}"
 
+async def build_variants(file_path: Path) -> List[dict]:
+    """Resized variants of an uploaded image; a failure keeps the original only"""
+    try:
+        return await image_variants.create_variants(file_path)
+    except Exception as e:
+        logger.warning(f"Image variants for {file_path.name} failed: {e}")
+        return []
+
 @router.post("/upload/image")
 async def upload_image(
     file: UploadFile = File(...),
@@ -55,12 +73,15 @@ async def upload_image(
     # Generate unique filename
     unique_filename = generate_unique_filename(file.filename)
     file_path = UPLOAD_DIR / unique_filename
+    variants = []
     
     try:
         # Save file
         with open(file_path, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
         
+        variants = await build_variants(file_path)
+        
         # Save file info to database
         file_info = {
             "filename": unique_filename,
@@ -68,6 +89,7 @@ async def upload_image(
             "content_type": file.content_type,
             "size": file.size,
             "url": f"/api/media/{unique_filename}",
+            "variants": variants,
             "uploaded_by": current_user.username,
             "uploaded_at": datetime.utcnow()
         }
@@ -80,13 +102,15 @@ async def upload_image(
             "filename": unique_filename,
             "url": file_info["url"],
             "original_filename": file.filename,
-            "size": file.size
+            "size": file.size,
+            "variants": variants
         }
         
     except Exception as e:
         # Clean up file if database operation fails
         if file_path.exists():
             file_path.unlink()
+        remove_variants(UPLOAD_DIR, variants)
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -104,7 +128,8 @@ async def get_media_file(filename: str):
     # Get file info from database for content type
     file_info = await find_one(Collections.UPLOADS, {"filename": filename})
     
-    content_type = "application/octet-stream"
+    # Variants have no uploads document of their own
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
     if file_info and "content_type" in file_info:
         content_type = file_info["content_type"]
     
@@ -114,20 +139,20 @@ async def get_media_file(filename: str):
         filename=filename
     )
 
-@router.get("/media", response_model=List[FileUpload])
+@router.get("/media", response_model=Page[FileUpload])
 async def get_media_files(
-    limit: int = 50,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
     current_user: AdminUser = Depends(get_current_admin_user)
 ):
-    """Get list of uploaded media files (admin only)"""
-    files = await find_many(
+    """Get a page of uploaded media files (admin only)"""
+    return await paginate(
         Collections.UPLOADS,
         {},
         [("uploaded_at", -1)],  # Sort by newest first
+        cursor,
         limit
     )
-    
-    return files
 
 @router.delete("/media/{filename}")
 async def delete_media_file(
@@ -145,6 +170,7 @@ async def delete_media_file(
     file_path = UPLOAD_DIR / filename
     if file_path.exists():
         file_path.unlink()
+    remove_variants(UPLOAD_DIR, file_info.get("variants"))
     
     # Delete from database
     result = await delete_one(Collections.UPLOADS, {"filename": filename})
@@ -174,6 +200,8 @@ async def upload_bulk_images(
     failed_files = []
     
     for file in files:
+        file_path = None
+        variants = []
         try:
             # Check file extension
             if not is_allowed_file(file.filename):
@@ -199,6 +227,8 @@ async def upload_bulk_images(
             with open(file_path, "wb") as buffer:
                 shutil.copyfileobj(file.file, buffer)
             
+            variants = await build_variants(file_path)
+            
             # Save file info to database
             file_info = {
                 "filename": unique_filename,
@@ -206,6 +236,7 @@ async def upload_bulk_images(
                 "content_type": file.content_type,
                 "size": file.size,
                 "url": f"/api/media/{unique_filename}",
+                "variants": variants,
                 "uploaded_by": current_user.username,
                 "uploaded_at": datetime.utcnow()
             }
@@ -216,10 +247,15 @@ async def upload_bulk_images(
                 "filename": unique_filename,
                 "original_filename": file.filename,
                 "url": file_info["url"],
-                "size": file.size
+                "size": file.size,
+                "variants": variants
             })
             
         except Exception as e:
+            # Clean up files of the failed upload
+            if file_path is not None and file_path.exists():
+                file_path.unlink()
+            remove_variants(UPLOAD_DIR, variants)
             failed_files.append({
                 "filename": file.filename,
                 "error": str(e)
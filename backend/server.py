@@ -2,19 +2,32 @@ from fastapi import FastAPI, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+import asyncio
 import os
 import logging
+import time
 from pathlib import Path
 
 # Import database and auth functions
-from database import connect_to_mongo, close_mongo_connection, init_default_data
+from database import (
+    connect_to_mongo, close_mongo_connection, init_default_data,
+    ensure_indexes, check_query_plans
+)
 from auth import create_default_admin
+from passwords import password_pool
+from images import image_variants
+from lead_search import backfill_search_fields
+from rollups import backfill_rollups
+from matching import matching_engine
+from ingest import lead_ingest
+from notifications import lead_notifications
+from publisher import STATIC_CONTENT_DIR
 
 # Import routers
-from routes.content import router as content_router
+from routes.content import router as content_router, content_publisher
 from routes.leads import router as leads_router
 from routes.auth import router as auth_router
-from routes.media import router as media_router
+from routes.media import router as media_router, ensure_upload_dir
 
 # Configure logging
 logging.basicConfig(
@@ -23,27 +36,76 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class StartupTimer:
+    """Collects the duration of each startup phase in milliseconds"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings = {}
+
+    async def run(self, name: str, coro):
+        start = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            self.timings[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    def total(self) -> float:
+        return round((time.perf_counter() - self.started) * 1000, 1)
+
+async def prepare_indexes():
+    """Create declared indexes (INDEX_CHECK=1 also explains every query shape)"""
+    await ensure_indexes()
+    if os.environ.get("INDEX_CHECK", "").lower() in ("1", "true", "yes"):
+        await check_query_plans()
+
 # Lifespan event handler
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up Komfort.City Backend...")
+    timer = StartupTimer()
+    
+    # Connect to database (and create the upload directory meanwhile)
+    await asyncio.gather(
+        timer.run("connect", connect_to_mongo()),
+        timer.run("upload_dir", asyncio.to_thread(ensure_upload_dir))
+    )
     
-    # Connect to database
-    await connect_to_mongo()
+    # Indexes first: the unique ones keep concurrently starting workers from
+    # seeding the default admin twice
+    await timer.run("indexes", prepare_indexes())
     
-    # Initialize default data
-    await init_default_data()
+    # Independent steps: default data, the default admin user and lead backfills
+    await asyncio.gather(
+        timer.run("default_data", init_default_data()),
+        timer.run("default_admin", create_default_admin()),
+        timer.run("lead_search_backfill", backfill_search_fields()),
+        timer.run("lead_rollups_backfill", backfill_rollups())
+    )
     
-    # Create default admin user
-    await create_default_admin()
+    # Export public content as static JSON and build the solution index (both need
+    # the default data), and replay leads left in the spool by a previous run
+    await asyncio.gather(
+        timer.run("static_content", content_publisher.publish_all()),
+        timer.run("solution_index", matching_engine.refresh()),
+        timer.run("lead_spool", lead_ingest.start())
+    )
     
-    logger.info("✅ Backend startup completed")
+    lead_notifications.start()
+    
+    app.state.startup_timings = {**timer.timings, "total": timer.total()}
+    breakdown = ", ".join(f"{name}={ms}ms" for name, ms in app.state.startup_timings.items())
+    logger.info(f"✅ Backend startup completed ({breakdown})")
     
     yield
     
     # Shutdown
     logger.info("Shutting down...")
+    await lead_ingest.stop()
+    await lead_notifications.stop()
+    password_pool.shutdown()
+    image_variants.shutdown()
     await close_mongo_connection()
     logger.info("✅ Backend shutdown completed")
 
@@ -64,10 +126,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files for uploads
+# Mount static files for uploads (the directory is created during startup)
 uploads_dir = Path("/app/uploads")
-uploads_dir.mkdir(exist_ok=True)
-app.mount("/uploads", StaticFiles(directory=uploads_dir), name="uploads")
+app.mount("/uploads", StaticFiles(directory=uploads_dir, check_dir=False), name="uploads")
+
+# Mount exported public content (written at startup and after every content change)
+if STATIC_CONTENT_DIR:
+    app.mount("/content", StaticFiles(directory=STATIC_CONTENT_DIR, check_dir=False), name="content")
 
 # API Router with /api prefix
 api_router = APIRouter(prefix="/api")
@@ -0,0 +1,116 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from database import Collections
+
+# Table layout: header, then one fixed-size slot per collection
+MAGIC = b"KCVER001"
+HEADER = struct.Struct("<8s8sQ")  # magic, layout digest, epoch
+SLOT = struct.Struct("<Qq")  # version counter, last modified (µs since Unix epoch, 0 = unknown)
+
+UNIX_EPOCH = datetime(1970, 1, 1)
+
+def collection_names() -> List[str]:
+    """Collection names in declaration order of database.Collections"""
+    return [
+        value for key, value in vars(Collections).items()
+        if not key.startswith("_") and isinstance(value, str)
+    ]
+
+def default_table_path() -> str:
+    """Per-database table file, in shared memory where available"""
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    db_name = os.environ.get("DB_NAME", "komfort_city")
+    return os.path.join(directory, f"komfort_city_versions_{db_name}")
+
+def _to_micros(value: datetime) -> int:
+    return (value - UNIX_EPOCH) // timedelta(microseconds=1)
+
+def _from_micros(value: int) -> Optional[datetime]:
+    return UNIX_EPOCH + timedelta(microseconds=value) if value else None
+
+class SharedVersionTable:
+    """Memory-mapped version table shared by all workers on a host.
+
+    Reads are a single unpack from the mapping. Writes take a POSIX record lock
+    on the file so increments from different workers never get lost. The
+    header carries a digest of the collection layout; a table written by a
+    different layout is reset together with its epoch.
+    """
+
+    def __init__(self, path: str, names: List[str]):
+        self.path = path
+        self._slots = {name: index for index, name in enumerate(names)}
+        self._size = HEADER.size + SLOT.size * len(names)
+        layout = hashlib.sha1("\0".join(names).encode()).digest()[:8]
+
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            with self._locked(fd):
+                if os.fstat(fd).st_size < self._size:
+                    os.ftruncate(fd, self._size)
+                self._mmap = mmap.mmap(fd, self._size)
+
+                magic, stored_layout, _ = HEADER.unpack_from(self._mmap, 0)
+                if magic != MAGIC or stored_layout != layout:
+                    self._mmap[:] = bytes(self._size)
+                    HEADER.pack_into(self._mmap, 0, MAGIC, layout, time.time_ns())
+        except Exception:
+            os.close(fd)
+            raise
+
+        self._fd = fd
+        self.epoch = HEADER.unpack_from(self._mmap, 0)[2]
+
+    @contextmanager
+    def _locked(self, fd: int = None):
+        fd = self._fd if fd is None else fd
+        fcntl.lockf(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.lockf(fd, fcntl.LOCK_UN)
+
+    def _offset(self, collection_name: str) -> int:
+        return HEADER.size + SLOT.size * self._slots[collection_name]
+
+    def __contains__(self, collection_name: str) -> bool:
+        return collection_name in self._slots
+
+    def version(self, collection_name: str) -> int:
+        """Current version of a collection"""
+        return SLOT.unpack_from(self._mmap, self._offset(collection_name))[0]
+
+    def last_modified(self, collection_name: str) -> Optional[datetime]:
+        """Last modification time of a collection, None if unknown"""
+        return _from_micros(SLOT.unpack_from(self._mmap, self._offset(collection_name))[1])
+
+    def bump(self, collection_name: str, modified_at: datetime) -> int:
+        """Atomically increment the version and record the modification time"""
+        offset = self._offset(collection_name)
+        with self._locked():
+            version, _ = SLOT.unpack_from(self._mmap, offset)
+            SLOT.pack_into(self._mmap, offset, version + 1, _to_micros(modified_at))
+        return version + 1
+
+    def observe(self, collection_name: str, modified_at: datetime):
+        """Move the modification time forward if it is unknown or older"""
+        offset = self._offset(collection_name)
+        micros = _to_micros(modified_at)
+        with self._locked():
+            version, current = SLOT.unpack_from(self._mmap, offset)
+            if micros > current:
+                SLOT.pack_into(self._mmap, offset, version, micros)
+
+    def close(self):
+        """Unmap and close the table file"""
+        self._mmap.close()
+        os.close(self._fd)
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, NamedTuple, Optional, Set
+
+from fastapi.encoders import jsonable_encoder
+
+from cache import CONTENT_CACHE_TTL, content_versions, on_invalidate
+
+logger = logging.getLogger(__name__)
+
+def encode_json(value: Any) -> bytes:
+    """Encode a value exactly like FastAPI's JSONResponse does"""
+    return json.dumps(
+        jsonable_encoder(value),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+class Snapshot(NamedTuple):
+    version: int
+    variants: Dict[Hashable, bytes]
+    expires_at: float
+
+    def is_current(self, version: int) -> bool:
+        return self.version == version and self.expires_at > time.monotonic()
+
+class SnapshotStore:
+    """Encoded response bodies per collection, rebuilt once after each write.
+
+    The builder returns every variant of a collection (full document set plus
+    one per language) as ready-to-send JSON bytes, so public reads cost a
+    dictionary lookup instead of model validation and encoding. Snapshots also
+    expire after max_age, which bounds staleness from edits made outside the
+    API.
+    """
+
+    def __init__(
+        self,
+        builder: Callable[[str], Awaitable[Dict[Hashable, bytes]]],
+        collection_names: Iterable[str],
+        max_age: float = CONTENT_CACHE_TTL
+    ):
+        self._builder = builder
+        self.collection_names = set(collection_names)
+        self.max_age = max_age
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        on_invalidate(self.schedule_rebuild)
+
+    async def get(self, collection_name: str, variant: Hashable = None) -> Optional[bytes]:
+        """Encoded body of a variant, rebuilding first if the collection changed"""
+        snapshot = self._snapshots.get(collection_name)
+        if snapshot is None or not snapshot.is_current(content_versions.get(collection_name)):
+            snapshot = await self.rebuild(collection_name)
+        return snapshot.variants.get(variant)
+
+    async def rebuild(self, collection_name: str) -> Snapshot:
+        """Rebuild all variants of a collection (concurrent callers share one build)"""
+        lock = self._locks.setdefault(collection_name, asyncio.Lock())
+        async with lock:
+            version = content_versions.get(collection_name)
+            snapshot = self._snapshots.get(collection_name)
+            if snapshot is not None and snapshot.is_current(version):
+                return snapshot
+
+            variants = await self._builder(collection_name)
+            snapshot = Snapshot(version, variants, time.monotonic() + self.max_age)
+            # A write landed during the build; serve it once but do not keep it
+            if content_versions.get(collection_name) == version:
+                self._snapshots[collection_name] = snapshot
+            return snapshot
+
+    def schedule_rebuild(self, collection_name: str):
+        """Drop the snapshot and rebuild it in the background"""
+        if collection_name not in self.collection_names:
+            return
+
+        self._snapshots.pop(collection_name, None)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Rebuilt lazily on the next read
+
+        task = loop.create_task(self._rebuild_quietly(collection_name))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _rebuild_quietly(self, collection_name: str):
+        try:
+            await self.rebuild(collection_name)
+        except Exception as e:
+            logger.warning(f"Snapshot rebuild failed for {collection_name}: {e}")
+
+    def clear(self):
+        """Drop all snapshots"""
+        self._snapshots.clear()
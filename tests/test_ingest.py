@@ -0,0 +1,121 @@
+import asyncio
+import os
+
+import pytest
+from bson import ObjectId, json_util
+from pymongo.errors import BulkWriteError
+
+import ingest
+from ingest import DUPLICATE_KEY, LeadIngestQueue, SpoolSegment
+
+class FakeCollection:
+    """insert_many stand-in keeping documents by _id like a unique index would"""
+
+    def __init__(self):
+        self.documents = {}
+        self.calls = 0
+        self.fail_with = None
+
+    async def insert_many(self, collection_name, documents, ordered=True):
+        self.calls += 1
+        if self.fail_with is not None:
+            raise self.fail_with
+        errors = []
+        for index, document in enumerate(documents):
+            if document["_id"] in self.documents:
+                errors.append({"index": index, "code": DUPLICATE_KEY})
+            else:
+                self.documents[document["_id"]] = document
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "writeConcernErrors": []})
+
+@pytest.fixture
+def collection(monkeypatch):
+    fake = FakeCollection()
+    monkeypatch.setattr(ingest, "insert_many", fake.insert_many)
+    return fake
+
+def make_queue(directory, recorded):
+    async def after_insert(documents):
+        recorded.extend(documents)
+    return LeadIngestQueue(str(directory), "leads", after_insert=after_insert)
+
+def write_segment(path, documents, extra=b""):
+    with open(path, "wb") as spool:
+        for document in documents:
+            spool.write((json_util.dumps(document) + "\n").encode("utf-8"))
+        spool.write(extra)
+
+def test_submit_spools_then_flush_inserts_and_removes_segment(tmp_path, collection):
+    recorded = []
+    queue = make_queue(tmp_path, recorded)
+
+    async def run():
+        first = await queue.submit({"name": "A"})
+        second = await queue.submit({"name": "B"})
+        assert queue.pending() == 2
+        assert len(list(tmp_path.glob("*.jsonl"))) == 1
+        await queue.flush()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert set(collection.documents) == {first, second}
+    assert [document["name"] for document in recorded] == ["A", "B"]
+    assert queue.pending() == 0
+    assert list(tmp_path.glob("*.jsonl")) == []
+
+def test_claim_replays_abandoned_segment_and_skips_torn_line(tmp_path, collection):
+    documents = [{"_id": ObjectId(), "name": "A"}, {"_id": ObjectId(), "name": "B"}]
+    write_segment(tmp_path / "1-1.jsonl", documents, extra=b'{"_id": {"$oid": "6')
+    recorded = []
+    queue = make_queue(tmp_path, recorded)
+
+    assert queue._claim_abandoned() == 2
+    asyncio.run(queue.flush())
+    assert set(collection.documents) == {document["_id"] for document in documents}
+    assert len(recorded) == 2
+    assert list(tmp_path.glob("*.jsonl")) == []
+
+def test_claim_skips_segment_locked_by_a_live_owner(tmp_path):
+    owned = SpoolSegment.create(tmp_path)
+    owned.append({"_id": ObjectId(), "name": "A"})
+    try:
+        assert SpoolSegment.claim(owned.path) is None
+        assert make_queue(tmp_path, [])._claim_abandoned() == 0
+    finally:
+        owned.remove()
+
+def test_replayed_duplicates_are_not_recorded_twice(tmp_path, collection):
+    stored = {"_id": ObjectId(), "name": "A"}
+    collection.documents[stored["_id"]] = stored
+    fresh = {"_id": ObjectId(), "name": "B"}
+    write_segment(tmp_path / "1-1.jsonl", [stored, fresh])
+    recorded = []
+    queue = make_queue(tmp_path, recorded)
+
+    queue._claim_abandoned()
+    asyncio.run(queue.flush())
+    assert [document["_id"] for document in recorded] == [fresh["_id"]]
+    assert list(tmp_path.glob("*.jsonl")) == []
+
+def test_failed_insert_keeps_segment_for_retry(tmp_path, collection):
+    recorded = []
+    queue = make_queue(tmp_path, recorded)
+    collection.fail_with = BulkWriteError({
+        "writeErrors": [{"index": 0, "code": 121}], "writeConcernErrors": []
+    })
+
+    async def run():
+        await queue.submit({"name": "A"})
+        with pytest.raises(BulkWriteError):
+            await queue.flush()
+        assert queue.pending() == 1
+        assert len(list(tmp_path.glob("*.jsonl"))) == 1
+
+        collection.fail_with = None
+        await queue.flush()
+
+    asyncio.run(run())
+    assert len(collection.documents) == 1
+    assert len(recorded) == 1
+    assert list(tmp_path.glob("*.jsonl")) == []
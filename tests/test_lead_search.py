@@ -0,0 +1,37 @@
+import pytest
+
+from lead_search import normalize_phone, prefix_filters, search_fields
+
+@pytest.mark.parametrize("phone, digits", [
+    ("+38 (067) 123-45-67", "380671234567"),
+    ("067 123 45 67", "380671234567"),
+    ("380671234567", "380671234567"),
+    ("+48 601 234 567", "48601234567"),
+    ("", ""),
+    (None, ""),
+])
+def test_normalize_phone(phone, digits):
+    assert normalize_phone(phone) == digits
+
+def test_search_fields():
+    assert search_fields({"phone": "067 123 45 67", "email": " Anna@Example.com "}) == {
+        "phone_digits": "380671234567",
+        "phone_digits_rev": "765432176083",
+        "email_lower": "anna@example.com"
+    }
+
+def test_prefix_filters_phone_fragment():
+    assert prefix_filters("067 12") == [
+        {"phone_digits": {"$regex": "^3806712"}},
+        {"phone_digits_rev": {"$regex": "^21760"}},
+    ]
+    assert prefix_filters("+38 (067)") == [
+        {"phone_digits": {"$regex": "^38067"}},
+        {"phone_digits_rev": {"$regex": "^76083"}},
+    ]
+
+def test_prefix_filters_email_prefix_is_escaped():
+    assert prefix_filters("Anna.K+1@") == [{"email_lower": {"$regex": "^anna\\.k\\+1@"}}]
+
+def test_prefix_filters_words_use_text_search_only():
+    assert prefix_filters("котел газовий") == []
@@ -0,0 +1,52 @@
+import math
+import random
+
+import pytest
+from bson import ObjectId
+
+from matching import MONEY_UNITS, POWER_UNITS, SolutionIndex, estimate_heat_load, parse_range
+
+@pytest.mark.parametrize("text, units, expected", [
+    ("100 кВт - 10 МВт", POWER_UNITS, (100, 10000)),
+    ("50-200 кВт", POWER_UNITS, (50, 200)),
+    ("500 Вт - 2 кВт", POWER_UNITS, (0.5, 2)),
+    ("від 1 МВт", POWER_UNITS, (1000, math.inf)),
+    ("до 50 kW", POWER_UNITS, (0, 50)),
+    ("від 500 тис. грн", MONEY_UNITS, (500000, math.inf)),
+    ("1,5 - 3 млн", MONEY_UNITS, (1500000, 3000000)),
+    ("", POWER_UNITS, None),
+    (None, POWER_UNITS, None),
+    ("за запитом", POWER_UNITS, None),
+])
+def test_parse_range(text, units, expected):
+    assert parse_range(text, units) == expected
+
+def test_estimate_heat_load():
+    assert estimate_heat_load(1000, "office") == 80
+    assert estimate_heat_load(1000, "unknown") == 100
+    assert estimate_heat_load(0, "office") is None
+    assert estimate_heat_load(None, "office") is None
+
+def solutions():
+    ranges = ["10-100 кВт", "50-500 кВт", "100 кВт - 10 МВт", "від 1 МВт", "до 30 кВт", "200-400 кВт", "n/a"]
+    return [
+        {"_id": ObjectId(), "power_range": power_range, "popular": position % 2 == 0}
+        for position, power_range in enumerate(ranges)
+    ]
+
+def test_index_skips_unparseable_ranges():
+    assert len(SolutionIndex(solutions())) == 6
+
+def test_match_returns_covering_solutions_best_first():
+    index = SolutionIndex(solutions())
+    matches = index.match(75, limit=10)
+    assert {item.solution["power_range"] for _, item in matches} == {"10-100 кВт", "50-500 кВт"}
+    scores = [score for score, _ in matches]
+    assert scores == sorted(scores, reverse=True)
+    assert index.match(None) == []
+
+def test_match_many_agrees_with_match():
+    index = SolutionIndex(solutions())
+    generator = random.Random(17)
+    loads = [None, 0] + [generator.uniform(1, 20000) for _ in range(200)] + [30, 100, 1000]
+    assert index.match_many(loads) == [index.match(load) for load in loads]
@@ -0,0 +1,166 @@
+import asyncio
+import email
+import socketserver
+import threading
+import time
+from email import policy
+
+import pytest
+
+import notifications
+from notifications import EmailChannel, NotificationChannel, NotificationDispatcher
+
+class SMTPStubHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib.send_message; received messages go to server.messages"""
+
+    def reply(self, line: str):
+        self.wfile.write((line + "\r\n").encode())
+
+    def handle(self):
+        self.reply("220 localhost SMTP stub")
+        envelope = {"from": None, "to": []}
+        while True:
+            line = self.rfile.readline().decode().rstrip("\r\n")
+            command = line[:4].upper()
+            if command in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif command == "MAIL":
+                envelope["from"] = line.split(":", 1)[1].strip()
+                self.reply("250 OK")
+            elif command == "RCPT":
+                envelope["to"].append(line.split(":", 1)[1].strip())
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if data_line in (b".\r\n", b""):
+                        break
+                    data.append(data_line[1:] if data_line.startswith(b"..") else data_line)
+                self.server.messages.append((envelope, b"".join(data)))
+                envelope = {"from": None, "to": []}
+                self.reply("250 OK")
+            elif command == "QUIT" or not line:
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+@pytest.fixture
+def smtp_stub():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), SMTPStubHandler)
+    server.daemon_threads = True
+    server.messages = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def test_email_channel_sends_digest_to_smtp_server(smtp_stub):
+    host, port = smtp_stub.server_address
+    channel = EmailChannel(host, port, "noreply@komfort.city", ["sales@komfort.city", "ceo@komfort.city"], timeout=5)
+    channel.send([{"name": "Олена", "phone": "+380671234567"}, {"name": "Ivan", "area": 1200}])
+
+    assert len(smtp_stub.messages) == 1
+    envelope, data = smtp_stub.messages[0]
+    assert envelope["to"] == ["<sales@komfort.city>", "<ceo@komfort.city>"]
+    message = email.message_from_bytes(data, policy=policy.default)
+    assert message["Subject"] == "Нові заявки: 2"
+    body = message.get_content()
+    assert "Олена" in body and "+380671234567" in body and "1200" in body
+
+class FakeChannel(NotificationChannel):
+    name = "fake"
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.attempts = []
+        self.delivered = []
+
+    def send(self, leads):
+        self.attempts.append(time.monotonic())
+        if len(self.attempts) <= self.failures:
+            raise ConnectionError("channel down")
+        self.delivered.append([lead["name"] for lead in leads])
+
+async def wait_until(condition, timeout: float = 2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.005)
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(notifications, "NOTIFY_RETRY_DELAY", 0.02)
+    monkeypatch.setattr(notifications, "NOTIFY_MAX_ATTEMPTS", 3)
+
+def test_leads_within_the_window_make_one_digest():
+    channel = FakeChannel()
+    dispatcher = NotificationDispatcher([channel], workers=2, digest_window=0.05)
+
+    async def run():
+        dispatcher.start()
+        for name in ["A", "B", "C"]:
+            dispatcher.notify({"name": name})
+        await wait_until(lambda: dispatcher.counters["sent"] == 1)
+        await dispatcher.stop()
+
+    asyncio.run(run())
+    assert channel.delivered == [["A", "B", "C"]]
+
+def test_failed_delivery_is_retried_with_backoff(fast_retries):
+    channel = FakeChannel(failures=2)
+    dispatcher = NotificationDispatcher([channel], workers=1, digest_window=0)
+
+    async def run():
+        dispatcher.start()
+        dispatcher.notify({"name": "A"})
+        await wait_until(lambda: dispatcher.counters["sent"] == 1)
+        await dispatcher.stop()
+
+    asyncio.run(run())
+    assert channel.delivered == [["A"]]
+    assert dispatcher.counters["retried"] == 2
+    first_gap, second_gap = (b - a for a, b in zip(channel.attempts, channel.attempts[1:]))
+    assert first_gap >= 0.02 and second_gap >= 0.04
+
+def test_delivery_gives_up_after_max_attempts(fast_retries):
+    channel = FakeChannel(failures=10)
+    dispatcher = NotificationDispatcher([channel], workers=1, digest_window=0)
+
+    async def run():
+        dispatcher.start()
+        dispatcher.notify({"name": "A"})
+        await wait_until(lambda: dispatcher.counters["failed"] == 1)
+        stats = dispatcher.stats()
+        await dispatcher.stop()
+        return stats
+
+    stats = asyncio.run(run())
+    assert len(channel.attempts) == 3
+    assert stats["retried"] == 2 and stats["sent"] == 0 and stats["retrying"] == 0
+
+def test_stats_report_queue_depth_and_dropped_leads():
+    dispatcher = NotificationDispatcher([FakeChannel()], workers=1, queue_size=2, digest_window=0)
+
+    async def run():
+        dispatcher.start()
+        # The background tasks have not run yet, so the leads are still queued
+        for name in ["A", "B", "C"]:
+            dispatcher.notify({"name": name})
+        stats = dispatcher.stats()
+        await dispatcher.stop()
+        return stats
+
+    stats = asyncio.run(run())
+    assert stats["queued_leads"] == 2
+    assert stats["dropped"] == 1
+    assert stats["channels"] == ["fake"]
+
+def test_notify_is_a_no_op_without_channels():
+    dispatcher = NotificationDispatcher([])
+    dispatcher.start()
+    dispatcher.notify({"name": "A"})
+    assert dispatcher.stats()["queued_leads"] == 0
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from pagination import decode_cursor, encode_cursor, keyset_filter, with_tiebreaker
+
+def test_with_tiebreaker_follows_last_direction():
+    assert with_tiebreaker([("created_at", -1)]) == [("created_at", -1), ("_id", -1)]
+    assert with_tiebreaker([("order", 1), ("created_at", 1)]) == [("order", 1), ("created_at", 1), ("_id", 1)]
+    assert with_tiebreaker([("created_at", -1), ("_id", -1)]) == [("created_at", -1), ("_id", -1)]
+    assert with_tiebreaker([]) == [("_id", 1)]
+
+def test_keyset_filter_descending():
+    created_at, last_id = datetime(2026, 1, 2, 3, 4, 5), ObjectId()
+    assert keyset_filter([("created_at", -1), ("_id", -1)], [created_at, last_id]) == {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "_id": {"$lt": last_id}},
+    ]}
+
+def test_keyset_filter_mixed_directions():
+    last_id = ObjectId()
+    assert keyset_filter([("status", 1), ("order", -1), ("_id", 1)], ["new", 3, last_id]) == {"$or": [
+        {"status": {"$gt": "new"}},
+        {"status": "new", "order": {"$lt": 3}},
+        {"status": "new", "order": 3, "_id": {"$gt": last_id}},
+    ]}
+
+def test_cursor_round_trip_keeps_bson_types():
+    values = [datetime(2026, 1, 2, 3, 4, 5), ObjectId()]
+    assert decode_cursor(encode_cursor(values), 2) == values
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor([1, 2, 3]), encode_cursor({"a": 1})])
+def test_decode_cursor_rejects_foreign_cursors(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, 2)
+    assert error.value.status_code == 400
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import ratelimit
+from ratelimit import MemoryBackend, RateLimiter, RatePolicy, client_ip
+
+class FakeRequest:
+    def __init__(self, forwarded_for=None, host="10.0.0.1"):
+        self.headers = {"x-forwarded-for": forwarded_for} if forwarded_for is not None else {}
+        self.client = type("Client", (), {"host": host})
+
+def limiter(limit=3, window=60):
+    return RateLimiter({"login": RatePolicy("login", limit, window)}, MemoryBackend())
+
+def test_check_rejects_with_retry_after_once_exhausted():
+    rate_limiter = limiter()
+
+    async def run():
+        for _ in range(3):
+            await rate_limiter.check("login", "admin")
+        with pytest.raises(HTTPException) as error:
+            await rate_limiter.check("login", "admin")
+        return error.value
+
+    error = asyncio.run(run())
+    assert error.status_code == 429
+    assert int(error.headers["Retry-After"]) >= 1
+    assert rate_limiter.rejected == {"login": 1}
+
+def test_check_available_does_not_spend_tokens():
+    rate_limiter = limiter()
+
+    async def run():
+        for _ in range(10):
+            await rate_limiter.check_available("login", "admin")
+        for _ in range(3):
+            await rate_limiter.charge("login", "admin")
+        with pytest.raises(HTTPException):
+            await rate_limiter.check_available("login", "admin")
+        # Other keys keep their own budget
+        await rate_limiter.check_available("login", "editor")
+
+    asyncio.run(run())
+
+@pytest.mark.parametrize("forwarded_for, hops, expected", [
+    ("203.0.113.7", 1, "203.0.113.7"),
+    ("spoofed, 203.0.113.7", 1, "203.0.113.7"),
+    ("spoofed, 203.0.113.7, 10.0.0.2", 2, "203.0.113.7"),
+    ("203.0.113.7", 2, "10.0.0.1"),
+    ("", 1, "10.0.0.1"),
+    (None, 1, "10.0.0.1"),
+])
+def test_client_ip_takes_trusted_hop_from_the_right(monkeypatch, forwarded_for, hops, expected):
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_TRUST_PROXY", True)
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_PROXY_HOPS", hops)
+    assert client_ip(FakeRequest(forwarded_for)) == expected
+
+def test_client_ip_ignores_header_without_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_TRUST_PROXY", False)
+    assert client_ip(FakeRequest("203.0.113.7")) == "10.0.0.1"